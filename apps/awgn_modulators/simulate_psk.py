@@ -30,10 +30,13 @@ class VerySimplePskSimulationRunner(SimulationRunner):
     """This is a complete example with the minimum code to actually perform
     a simulation.
 
-    Basically, we implement the _run_simulation method, which here performs
-    the simulation of a 4-PSK transmission in an AWGN channel, as well as
-    the optional _keep_going method to allow an earlier termination of the
-    simulation when a maximum number of bit errors is achieved.
+    Basically, we implement the _run_simulation_batch method, which here
+    performs the simulation of a 4-PSK transmission in an AWGN channel, as
+    well as the optional _keep_going method to allow an earlier termination
+    of the simulation when a maximum number of bit errors is achieved.
+
+    Since each iteration is very cheap, _run_simulation_batch (instead of
+    _run_simulation) is implemented to simulate several iterations at once.
 
     The simulation parameters can be directly set as regular attributes in
     the __init__ method, since they can be accessed in the _run_simulation
@@ -63,15 +66,16 @@ class VerySimplePskSimulationRunner(SimulationRunner):
         self.params.add('SNR', SNR)
         self.params.set_unpack_parameter('SNR')
 
-    def _run_simulation(self, current_parameters):
-        """The _run_simulation method is where the actual code to simulate
-        the system is.
+    def _run_simulation_batch(self, current_parameters, num_reps):
+        """The _run_simulation_batch method is where the actual code to
+        simulate the system is.
 
-        The implementation of this method is required by every subclass of
-        SimulationRunner.
+        Every subclass of SimulationRunner must implement either this
+        method or the _run_simulation method. Here we simulate the
+        transmission of `num_reps` times `self.NSymbs` symbols at once.
         """
         # xxxxx Input parameters (set in the constructor) xxxxxxxxxxxxxxxxx
-        NSymbs = self.NSymbs
+        NSymbs = self.NSymbs * num_reps
         M = self.modulator.M
         SNR = current_parameters["SNR"]
         # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
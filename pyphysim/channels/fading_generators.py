@@ -10,7 +10,8 @@ from ..util.misc import randn_c
 
 # noinspection PyPep8
 def generate_jakes_samples(Fd, Ts=1e-3, NSamples=100, L=8, shape=None,
-                           current_time=0, phi_l=None, psi_l=None):
+                           current_time=0, phi_l=None, psi_l=None,
+                           rng=None):
     """
     Generates channel samples according to the Jakes model.
 
@@ -43,6 +44,10 @@ def generate_jakes_samples(Fd, Ts=1e-3, NSamples=100, L=8, shape=None,
         The "phi" part in Jakes model
     psi_l : np.ndarray
         The "psi" part in Jakes model
+    rng : np.random.Generator | np.random.RandomState, optional
+        The random number generator used to generate `phi_l` and `psi_l`
+        (if they are not provided). If not provided, the global
+        RandomState in numpy will be used.
 
     Returns
     -------
@@ -65,17 +70,19 @@ def generate_jakes_samples(Fd, Ts=1e-3, NSamples=100, L=8, shape=None,
         NSamples * Ts + current_time,
         Ts * 1.0000000001)
 
+    if rng is None:
+        rng = np.random
+
+    if shape is None:
+        phi_psi_shape = (L, 1)
+    else:
+        phi_psi_shape = (L,) + tuple(shape) + (1,)
+
     if phi_l is None:
-        if shape is None:
-            phi_l = np.random.rand(L, 1)
-        else:
-            phi_l = np.random.rand(L, *shape, 1)
+        phi_l = rng.random(phi_psi_shape)
 
     if psi_l is None:
-        if shape is None:
-            psi_l = np.random.rand(L, 1)
-        else:
-            psi_l = np.random.rand(L, *shape, 1)
+        psi_l = rng.random(phi_psi_shape)
 
     # Update the self._current_time variable with the value of the next
     # time sample that should be generated when _generate_time_samples
@@ -205,10 +212,14 @@ class RayleighSampleGenerator(FadingSampleGenerator):
         The shape of the sample generator. Each time the
         `generate_jakes_samples` method is called it will generate samples
         with this shape. If not provided, then 1 will be assumed.
+    rng : np.random.Generator | np.random.RandomState, optional
+        The random number generator used to generate the samples. If not
+        provided, the global RandomState in numpy will be used.
     """
 
-    def __init__(self, shape=None):
+    def __init__(self, shape=None, rng=None):
         super(RayleighSampleGenerator, self).__init__(shape)
+        self._rng = rng
 
         # Generate first sample
         self.generate_more_samples()
@@ -227,16 +238,16 @@ class RayleighSampleGenerator(FadingSampleGenerator):
 
         if num_samples is None:
             if shape is None:
-                self._samples = randn_c()
+                self._samples = randn_c(rng=self._rng)
             else:
                 # noinspection PyArgumentList
-                self._samples = randn_c(*shape)
+                self._samples = randn_c(*shape, rng=self._rng)
         elif self.shape is None:
-            self._samples = randn_c(num_samples)
+            self._samples = randn_c(num_samples, rng=self._rng)
         else:
             shape = list(shape)
             shape.append(num_samples)
-            self._samples = randn_c(*shape)
+            self._samples = randn_c(*shape, rng=self._rng)
 
     def skip_samples_for_next_generation(self,
                                          num_samples):  # pragma: no cover
@@ -268,14 +279,12 @@ class RayleighSampleGenerator(FadingSampleGenerator):
         -------
         RayleighSampleGenerator
             Another RayleighSampleGenerator object with the same
-            configuration of this object.
+            configuration of this object. It also uses the same random
+            number generator (if one was provided).
         """
-        return RayleighSampleGenerator(self._shape)
+        return RayleighSampleGenerator(self._shape, self._rng)
 
 
-# TODO: Remove the RS parameter or make it work with the
-# get_similar_fading_generator method.  You could also move it to the base
-# class and add it as an argument to RayleighSampleGenerator
 # noinspection PyPep8
 class JakesSampleGenerator(FadingSampleGenerator):
     """
@@ -299,9 +308,10 @@ class JakesSampleGenerator(FadingSampleGenerator):
         could be used to generate MIMO channels. For instance, in order to
         generate channels samples for a MIMO scenario with 3 receive
         antennas and 2 transmit antennas use a shape of (3, 2).
-    RS : np.random.RandomState
-        The RandomState object used to generate the random values. If not
-        provided, the global RandomState in numpy will be used.
+    RS : np.random.RandomState | np.random.Generator
+        The RandomState (or Generator) object used to generate the random
+        values. If not provided, the global RandomState in numpy will be
+        used.
 
     See also
     --------
@@ -320,8 +330,8 @@ class JakesSampleGenerator(FadingSampleGenerator):
 
         if RS is None:
             # If RS was not provided, we set it to the numpy.random
-            # module. That way, when the rand "method" in RS is called it
-            # will actually call the global rand function in numpy.random.
+            # module. That way, when the random "method" in RS is called it
+            # will actually call the global random function in numpy.random.
             # RandomState object in numpy.
             RS = np.random
         self.RS = RS
@@ -391,8 +401,8 @@ class JakesSampleGenerator(FadingSampleGenerator):
             #  last dimensions as 1, instead of setting the dimension of
             #  phi_l and psi_l simply as (L,), because it will be
             # broadcasted later by numpy when we multiply with the time.
-            self._phi_l = 2 * np.pi * self.RS.rand(self.L, 1)
-            self._psi_l = 2 * np.pi * self.RS.rand(self.L, 1)
+            self._phi_l = 2 * np.pi * self.RS.random((self.L, 1))
+            self._psi_l = 2 * np.pi * self.RS.random((self.L, 1))
         else:
             # The dimension of phi_l and psi_l will be L x Shape x 1. We
             #  set the last dimensions as 1, instead of setting the
@@ -402,8 +412,8 @@ class JakesSampleGenerator(FadingSampleGenerator):
             new_shape = [self.L]
             new_shape.extend(self.shape)
             new_shape.append(1)
-            self._phi_l = 2 * np.pi * self.RS.rand(*new_shape)
-            self._psi_l = 2 * np.pi * self.RS.rand(*new_shape)
+            self._phi_l = 2 * np.pi * self.RS.random(new_shape)
+            self._psi_l = 2 * np.pi * self.RS.random(new_shape)
 
     def _generate_time_samples(self, num_samples=None):
         """
@@ -527,7 +537,7 @@ class JakesSampleGenerator(FadingSampleGenerator):
         -------
         JakesSampleGenerator
             Another JakesSampleGenerator object with the same configuration
-            of this object.
+            of this object. It also uses the same random number generator.
         """
         return JakesSampleGenerator(
-            self._Fd, self._Ts, self._L, self._shape)
+            self._Fd, self._Ts, self._L, self._shape, self.RS)
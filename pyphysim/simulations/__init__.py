@@ -13,6 +13,8 @@ More specifically, the :mod:`.simulations` module implements the classes:
  - :class:`.parameters.SimulationParameters`
  - :class:`.results.SimulationResults`
  - :class:`.results.Result`
+ - :class:`.cache.SimulationResultsCache`
+ - :class:`.zmqview.ZMQBrokerView`
 
 For a description of how to implement Monte Carlo simulations using the
 classes defined in the :mod:`.simulations` module see the section
@@ -23,6 +25,8 @@ classes defined in the :mod:`.simulations` module see the section
 from .parameters import *
 from .runner import *
 from .results import *
+from .cache import *
+from .zmqview import *
 
 
 # xxxxxxxxxx HDF5 xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
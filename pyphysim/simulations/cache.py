@@ -0,0 +1,296 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module containing a persistent cache for the results of finished
+simulation parameters variations.
+
+The :class:`SimulationResultsCache` class stores the
+:class:`.SimulationResults` object of each finished parameters variation
+in a folder, under a key computed from the parameters of the variation
+(see :func:`get_variation_key`). If a :class:`.SimulationResultsCache`
+object is set as the `results_cache` attribute of a
+:class:`.SimulationRunner`, the variations already in the cache are not
+simulated again. Therefore, extending a parameters sweep with new values
+only requires simulating the new variations.
+"""
+
+import os
+import hashlib
+import json
+import numpy as np
+
+try:
+    import cPickle as pickle
+except ImportError:  # pragma: no cover
+    import pickle
+
+__all__ = ["get_variation_key", "SimulationResultsCache"]
+
+
+# xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+# xxxxxxxxxxxxxxx Module Functions xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+# xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+def _to_canonical(obj):
+    """
+    Convert `obj` to an equivalent object that only contains lists, dicts
+    (with string keys), strings, ints, bools and None.
+
+    Floats are converted to their `repr` so that the representation does
+    not depend on how the JSON encoder formats them.
+
+    Parameters
+    ----------
+    obj : any
+        The object to be converted.
+
+    Returns
+    -------
+    list | dict | str | int | bool | None
+        The canonical representation of `obj`.
+    """
+    if isinstance(obj, np.ndarray):
+        return ['ndarray', str(obj.dtype), list(obj.shape),
+                _to_canonical(obj.tolist())]
+    if isinstance(obj, np.generic):
+        return _to_canonical(obj.item())
+    if isinstance(obj, dict):
+        return dict((str(key), _to_canonical(value))
+                    for key, value in obj.items())
+    if isinstance(obj, (set, frozenset)):
+        return ['set', sorted(_to_canonical(value) for value in obj)]
+    if isinstance(obj, (list, tuple)):
+        return [_to_canonical(value) for value in obj]
+    if isinstance(obj, bool) or obj is None:
+        return obj
+    if isinstance(obj, float):
+        return ['float', repr(obj)]
+    if isinstance(obj, complex):
+        return ['complex', repr(obj.real), repr(obj.imag)]
+    if isinstance(obj, int):
+        return obj
+    return ['{0}.{1}'.format(type(obj).__module__, type(obj).__name__),
+            str(obj)]
+
+
+def get_variation_key(runner, current_params):
+    """
+    Get the key that identifies the results of a parameters variation.
+
+    The key is a (stable) hash of the values of the simulation parameters
+    of the variation, the class of the runner, the `code_version`,
+    `rep_max` and `rng_seed` attributes of the runner. Two variations with
+    the same key are expected to produce statistically equivalent results.
+
+    Parameters
+    ----------
+    runner : SimulationRunner
+        The simulation runner.
+    current_params : SimulationParameters
+        The (unpacked) parameters of the variation.
+
+    Returns
+    -------
+    str
+        The key (an hexadecimal string).
+    """
+    parameters = dict(current_params.parameters)
+    # The 'rep_max' parameter may be added to the parameters when the
+    # progressbar message is created. We set it here in any case, since
+    # the results depend on rep_max.
+    parameters['rep_max'] = runner.rep_max
+
+    runner_class = type(runner)
+    data = {
+        'runner_class': '{0}.{1}'.format(runner_class.__module__,
+                                         runner_class.__name__),
+        'code_version': runner.code_version,
+        'rng_seed': runner.rng_seed,
+        'parameters': parameters
+    }
+    serialized = json.dumps(_to_canonical(data), sort_keys=True)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+
+# xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+# xxxxxxxxxxxxxxx SimulationResultsCache - START xxxxxxxxxxxxxxxxxxxxxxxxxx
+# xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+class SimulationResultsCache(object):
+    """
+    Persistent cache of the results of finished parameters variations.
+
+    Each entry is stored as a pickle file in `folder` named after its key
+    (see :func:`get_variation_key`). Since each entry is a single file,
+    written atomically, the cache can be shared by several worker
+    processes (even in different machines if `folder` is in a shared file
+    system).
+
+    When the total size of the stored entries exceeds `max_size` bytes the
+    least recently used entries are removed.
+
+    Parameters
+    ----------
+    folder : str
+        The folder where the entries are stored. It is created if it does
+        not exist.
+    max_size : int, optional
+        The maximum total size (in bytes) of the stored entries. The
+        default value is 1 GiB. If it is None, the size is not bounded.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+       runner.results_cache = SimulationResultsCache('results_cache')
+       runner.code_version = '1.2'
+       runner.simulate()
+    """
+    _extension = '.pickle'
+
+    def __init__(self, folder, max_size=2 ** 30):
+        self.folder = folder
+        self.max_size = max_size
+
+    def _get_filename(self, key):
+        """
+        Get the name of the file storing the entry with key `key`.
+
+        Parameters
+        ----------
+        key : str
+            The entry key.
+
+        Returns
+        -------
+        str
+            The filename.
+        """
+        return os.path.join(self.folder, key + self._extension)
+
+    def __contains__(self, key):
+        return os.path.isfile(self._get_filename(key))
+
+    def __len__(self):
+        return len(self._get_entries())
+
+    def get(self, key):
+        """
+        Get the entry with key `key`.
+
+        Parameters
+        ----------
+        key : str
+            The entry key.
+
+        Returns
+        -------
+        (int, SimulationResults) | None
+            The number of repetitions and the results of the variation, or
+            None if there is no entry with key `key`.
+        """
+        filename = self._get_filename(key)
+        try:
+            with open(filename, 'rb') as cache_file:
+                current_rep, current_sim_results = pickle.load(cache_file)
+        except (IOError, OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+        # Update the modification time, which is used to find the least
+        # recently used entries
+        try:
+            os.utime(filename, None)
+        except OSError:  # pragma: no cover
+            pass
+
+        return current_rep, current_sim_results
+
+    def put(self, key, current_rep, current_sim_results):
+        """
+        Store the results of a variation with key `key`.
+
+        Parameters
+        ----------
+        key : str
+            The entry key.
+        current_rep : int
+            The number of repetitions of the variation.
+        current_sim_results : SimulationResults
+            The results of the variation.
+        """
+        if not os.path.isdir(self.folder):
+            try:
+                os.makedirs(self.folder)
+            except OSError:  # pragma: no cover
+                # Another process may have created the folder
+                if not os.path.isdir(self.folder):
+                    raise
+
+        filename = self._get_filename(key)
+        # Write to a temporary file first and rename it, so that an entry
+        # is either complete or missing.
+        tmp_filename = '{0}.{1}.tmp'.format(filename, os.getpid())
+        with open(tmp_filename, 'wb') as cache_file:
+            pickle.dump((current_rep, current_sim_results), cache_file,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.rename(tmp_filename, filename)
+
+        self._evict()
+
+    def clear(self):
+        """
+        Remove all entries from the cache.
+        """
+        for filename, _, _ in self._get_entries():
+            try:
+                os.remove(filename)
+            except OSError:  # pragma: no cover
+                pass
+
+    def _get_entries(self):
+        """
+        Get the files of all entries in the cache.
+
+        Returns
+        -------
+        list[(str, float, int)]
+            List with the filename, the modification time and the size of
+            each entry.
+        """
+        if not os.path.isdir(self.folder):
+            return []
+
+        entries = []
+        for name in os.listdir(self.folder):
+            if not name.endswith(self._extension):
+                continue
+            filename = os.path.join(self.folder, name)
+            try:
+                stat = os.stat(filename)
+            except OSError:  # pragma: no cover
+                # The entry was removed by another process
+                continue
+            entries.append((filename, stat.st_mtime, stat.st_size))
+        return entries
+
+    def _evict(self):
+        """
+        Remove the least recently used entries until the total size of the
+        entries is not greater than `max_size`.
+        """
+        if self.max_size is None:
+            return
+
+        entries = self._get_entries()
+        total_size = sum(size for _, _, size in entries)
+        # Oldest entries first
+        entries.sort(key=lambda entry: entry[1])
+        for filename, _, size in entries:
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(filename)
+            except OSError:  # pragma: no cover
+                pass
+            total_size -= size
+# xxxxxxxxxx SimulationResultsCache - END xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
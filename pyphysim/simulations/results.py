@@ -28,9 +28,39 @@ except ImportError:  # pragma: no cover
 __all__ = ["combine_simulation_results", "SimulationResults", "Result"]
 
 
+# Prefixes of the names of the SUMTYPE results with the wall and CPU time
+# of each stage of a simulation (see SimulationRunner.timed).
+STAGE_WALL_TIME_PREFIX = 'stage_wall_time:'
+STAGE_CPU_TIME_PREFIX = 'stage_cpu_time:'
+# Names of the MISCTYPE results with the memory usage of the simulation
+# (see the memory_tracking_enabled attribute of SimulationRunner).
+MEMORY_RESULT_NAMES = ('peak_memory', 'memory_growth_per_rep')
+
+
 # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
 # xxxxxxxxxxxxxxx Module Functions xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
 # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+def _is_optional_result(name):
+    """
+    Check if `name` is the name of a result created by the
+    SimulationRunner class that may be missing in some SimulationResults
+    objects, such as the 'num_skipped_reps' result, the results with the
+    time of each stage of the simulation and the memory usage results.
+
+    Parameters
+    ----------
+    name : str
+        The name of the result.
+
+    Returns
+    -------
+    bool
+        True if the result is optional.
+    """
+    return (name == 'num_skipped_reps' or name in MEMORY_RESULT_NAMES or
+            name.startswith((STAGE_WALL_TIME_PREFIX, STAGE_CPU_TIME_PREFIX)))
+
+
 def combine_simulation_results(simresults1, simresults2):
     """
     Combine two SimulationResults objects with different parameters values.
@@ -1207,30 +1237,46 @@ class SimulationResults(JsonSerializable):
         # Otherwise, we merge each Result from `self` with the Result from
         # `other`
         else:
+            other_names = other.get_result_names()
             for item in self.get_result_names():
-                # The 'num_skipped_reps' result is different from the other
-                # results in the sense that it is created by the
-                # SimulationRunner class to count how many times a
-                # SkipThisOne exception is raised. It is not created at the
-                # same time as the other Result objects, but we want to
-                # allow merging two SimulationResults objects even if one
-                # of them does not have a 'num_skipped_reps' Result object.
-                if item != 'num_skipped_reps':
+                # The 'num_skipped_reps' result (as well as the results
+                # with the time of each stage of the simulation) is
+                # different from the other results in the sense that it is
+                # created by the SimulationRunner class to count how many
+                # times a SkipThisOne exception is raised. It is not
+                # created at the same time as the other Result objects, but
+                # we want to allow merging two SimulationResults objects
+                # even if one of them does not have a 'num_skipped_reps'
+                # Result object.
+                if not _is_optional_result(item):
                     self._results[item][-1].merge(other[item][-1])
 
-            # Merge the 'num_skipped_reps' Result if the second object has
-            # it.
-            if 'num_skipped_reps' in other.get_result_names():
-                # It the second SimulationResults has the the
-                # 'num_skipped_reps' Result, but the first one has not,
-                # then first we create a 'num_skipped_reps' Result for the
-                # first SimulationResults object.
-                if 'num_skipped_reps' not in self.get_result_names():
-                    self.add_new_result('num_skipped_reps', Result.SUMTYPE, 0)
-
-                # Now we merge 'num_skipped_reps' from both of them
-                self._results['num_skipped_reps'][-1].merge(
-                    other['num_skipped_reps'][-1])
+            # Merge the optional results (such as 'num_skipped_reps') if
+            # the second object has them.
+            for item in other_names:
+                if not _is_optional_result(item):
+                    continue
+                other_result = other[item][-1]
+                # The memory usage results (MISCTYPE) cannot be merged and
+                # we keep the largest value.
+                if other_result.type_code == Result.MISCTYPE:
+                    if item not in self.get_result_names():
+                        self.add_new_result(item, Result.MISCTYPE,
+                                            other_result.get_result())
+                    elif (self[item][-1].get_result() <
+                          other_result.get_result()):
+                        self._results[item][-1].update(
+                            other_result.get_result())
+                    continue
+
+                # It the second SimulationResults has the optional Result,
+                # but the first one has not, then first we create the
+                # Result for the first SimulationResults object.
+                if item not in self.get_result_names():
+                    self.add_new_result(item, Result.SUMTYPE, 0)
+
+                # Now we merge the Result from both of them
+                self._results[item][-1].merge(other_result)
 
     def get_result_names(self):
         """
@@ -5,9 +5,32 @@
 
 from time import time
 import sys
+import functools
 import os
 import itertools
 import argparse
+import multiprocessing
+import struct
+import copy
+import warnings
+import numpy as np
+
+try:
+    import cPickle as pickle
+except ImportError:  # pragma: no cover
+    import pickle
+
+try:
+    from time import process_time
+except ImportError:  # pragma: no cover
+    # Python 2
+    from time import clock as process_time
+
+try:
+    import tracemalloc
+except ImportError:  # pragma: no cover
+    # Python 2
+    tracemalloc = None
 
 try:
     # noinspection PyUnresolvedReferences
@@ -16,14 +39,17 @@ except ImportError:  # pragma: no cover
     pass
 
 from .parameters import SimulationParameters
-from .results import SimulationResults, Result
+from .results import SimulationResults, Result, STAGE_WALL_TIME_PREFIX, \
+    STAGE_CPU_TIME_PREFIX, MEMORY_RESULT_NAMES
+from .cache import get_variation_key
 
 from ..util.misc import pretty_time
 from .progressbar import ProgressbarText, ProgressbarText2, \
-    ProgressbarText3, ProgressbarZMQServer, ProgressBarIPython
+    ProgressbarText3, ProgressbarZMQServer, ProgressBarIPython, \
+    ProgressbarMultiProcessServer, ProgressbarDistributedClientBase
 
 __all__ = ["get_partial_results_filename", "SimulationRunner",
-           "SkipThisOne"]
+           "SkipThisOne", "LocalProcessPoolView", "timed_stage"]
 
 
 # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
@@ -130,6 +156,81 @@ def get_partial_results_filename(results_base_filename,
     return partial_results_filename
 
 
+def _append_to_checkpoint_log(filename, record):
+    """
+    Append `record` to the checkpoint log file `filename`.
+
+    Each record is stored as its pickled representation preceded by its
+    length (an 8 bytes unsigned integer). The record is written with a
+    single write call and flushed to disk before returning, so that a
+    crash leaves at most an incomplete record at the end of the file,
+    which is ignored by :func:`_load_checkpoint_log`.
+
+    Parameters
+    ----------
+    filename : str
+        The name of the checkpoint log file. It is created if it does not
+        exist.
+    record : any
+        The (picklable) record.
+    """
+    data = pickle.dumps(record, protocol=2)
+    with open(filename, 'ab') as log_file:
+        log_file.write(struct.pack('>Q', len(data)) + data)
+        log_file.flush()
+        os.fsync(log_file.fileno())
+
+
+def _load_checkpoint_log(filename):
+    """
+    Load all the records in the checkpoint log file `filename`.
+
+    If the file ends with an incomplete record (the process writing it
+    was interrupted) the incomplete record is removed from the file, so
+    that new records can be appended to it.
+
+    Parameters
+    ----------
+    filename : str
+        The name of the checkpoint log file.
+
+    Returns
+    -------
+    list
+        The records in the file, in the order they were appended. This is
+        an empty list if the file does not exist.
+    """
+    records = []
+    try:
+        log_file = open(filename, 'r+b')
+    except IOError:
+        return records
+
+    header_size = struct.calcsize('>Q')
+    with log_file:
+        valid_size = 0
+        while True:
+            header = log_file.read(header_size)
+            if len(header) < header_size:
+                break
+            size = struct.unpack('>Q', header)[0]
+            data = log_file.read(size)
+            if len(data) < size:
+                break
+            try:
+                records.append(pickle.loads(data))
+            except Exception:  # pragma: no cover
+                break
+            valid_size = log_file.tell()
+
+        # Remove any incomplete record at the end of the file
+        log_file.seek(0, os.SEEK_END)
+        if log_file.tell() > valid_size:
+            log_file.truncate(valid_size)
+
+    return records
+
+
 # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
 # xxxxxxxxxxxxxxx Exception xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
 # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
@@ -170,6 +271,250 @@ class SkipThisOne(Exception):
         return "SkipThisOne: {0}".format(self.msg)
 
 
+# xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+# xxxxxxxxxxxxxxx Stage Timers xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+# xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+class _NullStageTimer(object):
+    """
+    Context manager that does nothing.
+
+    It is returned by :meth:`SimulationRunner.timed` when the timing of
+    the simulation stages is disabled.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_STAGE_TIMER = _NullStageTimer()
+
+
+class _StageTimer(object):
+    """
+    Context manager that adds the wall and CPU time spent in its block to
+    the times of a stage of the simulation.
+
+    Parameters
+    ----------
+    stage_times : dict
+        Dictionary mapping the name of each stage to a list with its wall
+        and CPU times.
+    name : str
+        The name of the stage.
+    """
+
+    def __init__(self, stage_times, name):
+        self._stage_times = stage_times
+        self._name = name
+        self._wall_tic = 0.0
+        self._cpu_tic = 0.0
+
+    def __enter__(self):
+        self._wall_tic = time()
+        self._cpu_tic = process_time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        wall_time = time() - self._wall_tic
+        cpu_time = process_time() - self._cpu_tic
+        times = self._stage_times.setdefault(self._name, [0.0, 0.0])
+        times[0] += wall_time
+        times[1] += cpu_time
+        return False
+
+
+def timed_stage(name):
+    """
+    Decorator that times a method of a :class:`SimulationRunner` subclass
+    as the stage `name` of the simulation.
+
+    This is equivalent to running the whole method inside a
+    `with self.timed(name):` block (see :meth:`SimulationRunner.timed`).
+
+    Parameters
+    ----------
+    name : str
+        The name of the stage.
+
+    Returns
+    -------
+    callable
+        The decorator.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+       class MyRunner(SimulationRunner):
+           @timed_stage('channel')
+           def _generate_channel(self, current_params):
+               ...
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.timed(name):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+# xxxxxxxxxxxxxxx Memory Probe xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+# xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+class _MemoryProbe(object):
+    """
+    Measure the memory allocated (by Python and numpy) between the
+    creation of the object and the call of its `stop` method.
+
+    The memory is measured with the tracemalloc module, which is started
+    (and stopped in the `stop` method) if it is not already tracing.
+    """
+
+    def __init__(self):
+        if tracemalloc is None:  # pragma: no cover
+            raise RuntimeError('Memory tracking requires the tracemalloc'
+                               ' module (Python 3.4 or newer).')
+        self._stop_tracing = not tracemalloc.is_tracing()
+        if self._stop_tracing:
+            tracemalloc.start()
+        elif hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        self._base = tracemalloc.get_traced_memory()[0]
+
+    def stop(self):
+        """
+        Stop the measurement.
+
+        Returns
+        -------
+        (int, int)
+            The peak memory (in bytes) allocated after the creation of the
+            object and the memory still allocated.
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stop_tracing:
+            tracemalloc.stop()
+        return max(peak - self._base, 0), current - self._base
+
+
+# xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+# xxxxxxxxxxxxxxx LocalProcessPoolView - START xxxxxxxxxxxxxxxxxxxxxxxxxxxx
+# xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+class LocalProcessPoolView(object):
+    """
+    A "view" of local worker processes that can be used in place of an
+    IPython view in the :meth:`SimulationRunner.simulate_in_parallel`
+    method.
+
+    This class implements the small part of the interface of the IPython
+    `LoadBalancedView` class that is used by the :class:`SimulationRunner`
+    class, but the tasks are run in a pool of worker processes in the
+    local machine (created with the multiprocessing module). Therefore, no
+    IPython cluster is required to simulate in parallel in a single
+    machine with multiple cores.
+
+    Parameters
+    ----------
+    num_workers : int, optional
+        The number of worker processes. If not provided, the number of
+        CPUs in the machine will be used.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+       view = LocalProcessPoolView(4)
+       runner.simulate_in_parallel(view)
+       view.close()
+
+    The code above is equivalent to calling `runner.simulate(workers=4)`.
+    """
+
+    def __init__(self, num_workers=None):
+        if num_workers is None:
+            num_workers = multiprocessing.cpu_count()
+        self._num_workers = num_workers
+        self._pool = multiprocessing.Pool(num_workers)
+
+    def __len__(self):
+        """
+        Get the number of worker processes.
+
+        Returns
+        -------
+        int
+            The number of worker processes.
+        """
+        return self._num_workers
+
+    def map(self, f, *sequences, **kwargs):
+        """
+        Call `f` for each element of the provided sequences in the worker
+        processes.
+
+        Parameters
+        ----------
+        f : callable
+            The function to be called. It must be pickle-able.
+        *sequences : list
+            One sequence for each argument of `f`.
+        block : bool, optional
+            If True, wait for all tasks and return the list with the
+            results. If False (default) return an object with the `wait`
+            and `get` methods.
+
+        Returns
+        -------
+        multiprocessing.pool.AsyncResult | list
+            The results (or an object to get the results if `block` is
+            False) in the same order of the elements in `sequences`.
+        """
+        block = kwargs.get('block', False)
+        # A chunksize of 1 makes sure that a free worker always gets the
+        # next task, since each task is usually very long.
+        async_results = self._pool.starmap_async(f, zip(*sequences),
+                                                 chunksize=1)
+        if block is True:
+            return async_results.get()
+        return async_results
+
+    def apply_async(self, f, *args):
+        """
+        Call `f` with the arguments `args` in one of the worker processes.
+
+        Parameters
+        ----------
+        f : callable
+            The function to be called. It must be pickle-able.
+        *args
+            The arguments passed to `f`.
+
+        Returns
+        -------
+        multiprocessing.pool.AsyncResult
+            An object with the `ready`, `wait` and `get` methods to get
+            the result.
+        """
+        return self._pool.apply_async(f, args)
+
+    def close(self):
+        """
+        Wait for any pending task and stop the worker processes.
+        """
+        self._pool.close()
+        self._pool.join()
+# xxxxxxxxxx LocalProcessPoolView - END xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+
+
 # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
 # xxxxxxxxxxxxxxx SimulationRunner - START xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
 # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
@@ -354,6 +699,104 @@ class SimulationRunner(object):
         # to save the partial results in the same folder of the final
         # results.
         self.partial_results_folder = 'partial_results'
+        # The repetitions simulated since the last checkpoint of the
+        # partial results are appended to a checkpoint log every
+        # `partial_results_save_reps` repetitions and every
+        # `partial_results_save_interval` seconds. The log is compacted
+        # into the partial results file when the simulation of the
+        # parameters variation finishes.
+        self.partial_results_save_reps = 500
+        self.partial_results_save_interval = 300
+        # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+
+        # xxxxxxxxxx Configure the parallel simulation xxxxxxxxxxxxxxxxxxxx
+        # If this is None, each parameters variation is simulated by a
+        # single worker in the simulate_in_parallel method. If this is an
+        # integer, the repetitions of each parameters variation are split
+        # into chunks with (at most) reps_per_chunk repetitions, which are
+        # simulated by different workers and merged afterwards.
+        self.reps_per_chunk = None
+        # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+
+        # xxxxxxxxxx Configure the batch simulation xxxxxxxxxxxxxxxxxxxxxxx
+        # If the _run_simulation_batch method is implemented in a subclass
+        # it is called (instead of _run_simulation) with a number of
+        # repetitions that starts at 1 and doubles after each call, up to
+        # max_reps_per_batch repetitions.
+        self.max_reps_per_batch = 256
+        # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+
+        # xxxxxxxxxx Configure the scheduling of the variations xxxxxxxxxxx
+        # If this is True, the simulate_in_parallel method submits the
+        # parameters variations that are expected to take longer first. The
+        # expected cost of each variation is estimated from the results of
+        # a previous simulation (the elapsed time and the number of
+        # repetitions of each variation) stored in the results file, if it
+        # exists, or from a calibration pass.
+        self.cost_aware_scheduling = True
+        # Number of repetitions of each variation run in the calibration
+        # pass (the results of these repetitions are discarded). If this is
+        # 0, no calibration is performed and the variations are submitted
+        # in their original order when there is no previous results file.
+        self.calibration_reps = 0
+        # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+
+        # xxxxxxxxxx Configure the results cache xxxxxxxxxxxxxxxxxxxxxxxxxxx
+        # A SimulationResultsCache object (or None). If it is set, the
+        # results of each finished parameters variation are stored in the
+        # cache and variations whose results are already in the cache are
+        # not simulated again.
+        self.results_cache = None
+        # Version of the simulation code. This is part of the key of the
+        # entries in the results cache and should be changed whenever a
+        # change in the code makes previously cached results invalid.
+        self.code_version = None
+        # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+
+        # xxxxxxxxxx Configure the timing of the simulation stages xxxxxxx
+        # If this is True, the wall and CPU time spent in each stage of the
+        # simulation (the blocks of the _run_simulation method inside a
+        # `with self.timed(name):` statement) are stored in the results as
+        # the SUMTYPE results 'stage_wall_time:name' and
+        # 'stage_cpu_time:name'.
+        self.stage_timing_enabled = False
+        # Wall and CPU times of each stage in the current repetition
+        self._stage_times = {}
+        # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+
+        # xxxxxxxxxx Configure the memory tracking xxxxxxxxxxxxxxxxxxxxxxxx
+        # If this is True, the peak memory (in bytes) allocated while
+        # simulating each parameters variation and the memory still
+        # allocated at the end divided by the number of repetitions are
+        # stored as the MISCTYPE results 'peak_memory' and
+        # 'memory_growth_per_rep'. This uses the tracemalloc module and
+        # makes the simulation slower.
+        self.memory_tracking_enabled = False
+        # Memory budget (in bytes) of each parameters variation. If the
+        # peak memory of a variation is greater than this the
+        # _on_memory_budget_exceeded method is called.
+        self.memory_budget = None
+        # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+
+        # List of (result_name, max_relative_half_width, P, min_updates)
+        # tuples with the stop criteria added with the
+        # add_confidence_interval_stop_criterion method.
+        self._stop_criteria = []
+
+        # xxxxxxxxxx Random number generation xxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+        # Seed (an int or None) of the root np.random.SeedSequence of the
+        # simulation. If it is None, fresh entropy is used for each
+        # simulation.
+        self.rng_seed = None
+        # np.random.Generator object that should be used in the
+        # _run_simulation method to generate any random value. An
+        # independent generator, derived from the root SeedSequence, is
+        # set here for each parameters variation and for each chunk of
+        # reps_per_chunk repetitions (if reps_per_chunk is not None). With
+        # that, the results of a simulation with a given rng_seed are the
+        # same no matter if it was performed serially or in parallel (and
+        # regardless of the number of workers).
+        self.rng = None
         # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
 
         # xxxxx Internal variables you should not modify xxxxxxxxxxxxxxxxxx
@@ -379,6 +822,19 @@ class SimulationRunner(object):
         self.__toc = 0.0
         # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
 
+        # xxxxx Internal variables for the random number generation xxxxxxx
+        # Root SeedSequence of the current simulation. This is created in
+        # the simulate and simulate_in_parallel methods.
+        self._seed_sequence = None
+        # Repetition where the current self.rng generator started
+        self._rng_first_rep = None
+        # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+
+        # Order in which the variations were submitted in the
+        # simulate_in_parallel method (a list with the indexes of the
+        # variations), or None if they were submitted in the original order.
+        self._variations_order = None
+
     def set_results_filename(self, filename=None):
         """
         Set the name of the file where the simulation results will be
@@ -507,9 +963,156 @@ class SimulationRunner(object):
             # Do nothing if self.delete_partial_results_bool is not True
             pass
 
-    def __save_partial_results(self, current_rep, current_params,
-                               current_sim_results,
-                               partial_results_filename):
+    def _get_partial_results_filename(self, current_params):
+        """
+        Get the name of the file where the partial results for the
+        `current_params` are stored.
+
+        Parameters
+        ----------
+        current_params : SimulationParameters
+            The current parameters.
+
+        Returns
+        -------
+        str | None
+            The name of the partial results file, or None if the results
+            filename was not set (see :meth:`set_results_filename`).
+        """
+        if self._results_base_filename is None:
+            return None
+
+        return get_partial_results_filename(self.results_base_filename,
+                                            current_params,
+                                            self.partial_results_folder)
+
+    def _load_partial_results(self, current_params,
+                              partial_results_filename):
+        """
+        Load the partial results for the `current_params` from a file.
+
+        The partial results are the ones in the file plus the ones in its
+        checkpoint log (see :meth:`_append_partial_results`).
+
+        Parameters
+        ----------
+        current_params : SimulationParameters
+            The current parameters.
+        partial_results_filename : str | None
+            The name of the file with the partial results.
+
+        Returns
+        -------
+        (int, SimulationResults)
+            The number of repetitions stored in the partial results and the
+            partial results.
+
+        Raises
+        ------
+        IOError
+            If `partial_results_filename` is None or if neither the file
+            nor its checkpoint log exist.
+        ValueError
+            If the loaded partial results do not match `current_params`.
+        """
+        if partial_results_filename is None:
+            # If __results_base_filename is None there is also no partial
+            # results to load.
+            raise IOError()
+
+        try:
+            current_sim_results = SimulationResults.load_from_file(
+                partial_results_filename)
+            current_rep = current_sim_results.current_rep
+        except IOError:
+            # The simulation may have been interrupted before the first
+            # compaction of the checkpoint log
+            current_sim_results = None
+            current_rep = 0
+
+        # Replay the checkpoint log. Records with a repetition not greater
+        # than the one in the file are already included in it (the
+        # simulation was interrupted during the compaction).
+        log_filename = self._get_partial_results_log_filename(
+            partial_results_filename)
+        for rep, delta_sim_results in _load_checkpoint_log(log_filename):
+            if rep <= current_rep:
+                continue
+            if current_sim_results is None:
+                current_sim_results = delta_sim_results
+            else:
+                current_sim_results.merge_all_results(delta_sim_results)
+            current_rep = rep
+
+        if current_sim_results is None:
+            raise IOError(
+                "No partial results in '{0}'".format(partial_results_filename))
+        current_sim_results.current_rep = current_rep
+
+        num_skipped_reps_result = Result.create(
+            "num_skipped_reps", Result.SUMTYPE, 0)
+        current_sim_results.add_result(num_skipped_reps_result)
+
+        # Note that at this point we have successfully loaded the partial
+        # results from the file. However, we still need to make sure it
+        # matches our current parameters. It it does not match the user
+        # likely used a wrong name and we raise an exception to stop the
+        # simulation.
+        #
+        # NOTE: If the type of this exception is changed in the future
+        # make sure it is not an IOError.
+        if not current_params == current_sim_results.params:
+            err_msg = ("Partial results loaded from file does not match"
+                       " current parameters. \nfile: {0}")
+            raise ValueError(err_msg.format(partial_results_filename))
+
+        # noinspection PyUnresolvedReferences
+        return current_sim_results.current_rep, current_sim_results
+
+    def _get_cached_results(self, current_params):
+        """
+        Get the results of the `current_params` from the results cache.
+
+        Parameters
+        ----------
+        current_params : SimulationParameters
+            The current parameters.
+
+        Returns
+        -------
+        (int, SimulationResults) | None
+            The number of repetitions and the results, or None if the
+            `results_cache` attribute is None or if the results are not in
+            the cache.
+        """
+        if self.results_cache is None:
+            return None
+        return self.results_cache.get(
+            get_variation_key(self, current_params))
+
+    def _cache_results(self, current_params, current_rep,
+                       current_sim_results):
+        """
+        Store the (finished) results of the `current_params` in the results
+        cache, if the `results_cache` attribute is not None.
+
+        Parameters
+        ----------
+        current_params : SimulationParameters
+            The current parameters.
+        current_rep : int
+            The number of repetitions.
+        current_sim_results : SimulationResults
+            The results of the current parameters.
+        """
+        if self.results_cache is not None:
+            current_sim_results.set_parameters(current_params)
+            self.results_cache.put(get_variation_key(self, current_params),
+                                   current_rep, current_sim_results)
+
+    def _save_partial_results(self, current_rep, current_params,
+                              current_sim_results,
+                              partial_results_filename):
         """
         Save the partial simulation results to a file.
 
@@ -535,10 +1138,10 @@ class SimulationRunner(object):
         be automatically added to the list of files to be deleted after the
         simulation is finished if delete_partial_results_bool is
         True. However, remember that in the simulate_in_parallel method
-        this method will be run in a different object in an IPython
-        engine. Therefore, you will need to manually add, the value of the
-        partial_results_filename variable to the list of files to be
-        deleted (the __results_base_filename_unpack_list variable).
+        this method will (usually) be run in a different object in an
+        IPython engine. Therefore, you will need to manually add, the value
+        of the partial_results_filename variable to the list of files to be
+        deleted (the _results_base_filename_unpack_list variable).
         """
         # xxxxxxxxxx Save partial results to file xxxxxxxxxxxxxxxxxxxxx
         # First we add the current parameters to the partial simulation
@@ -564,6 +1167,66 @@ class SimulationRunner(object):
         self._results_base_filename_unpack_list.append(filename)
         # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
 
+        # The saved file has all the results in the checkpoint log, which
+        # can now be removed.
+        log_filename = self._get_partial_results_log_filename(
+            partial_results_filename)
+        if os.path.exists(log_filename):
+            os.remove(log_filename)
+
+    @staticmethod
+    def _get_partial_results_log_filename(partial_results_filename):
+        """
+        Get the name of the checkpoint log file of the partial results file
+        `partial_results_filename`.
+
+        Parameters
+        ----------
+        partial_results_filename : str
+            The name of the partial results file.
+
+        Returns
+        -------
+        str
+            The name of the checkpoint log file.
+        """
+        return '{0}.log'.format(os.path.splitext(partial_results_filename)[0])
+
+    def _append_partial_results(self, current_rep, current_params,
+                                delta_sim_results, partial_results_filename):
+        """
+        Append the results simulated since the last checkpoint to the
+        checkpoint log of the partial results file.
+
+        Contrary to :meth:`_save_partial_results`, which saves all the
+        partial results, only the new results are written. Therefore, the
+        cost of a checkpoint does not grow with the number of simulated
+        repetitions. The log is replayed by :meth:`_load_partial_results`
+        and it is compacted (removed) when :meth:`_save_partial_results` is
+        called.
+
+        Parameters
+        ----------
+        current_rep : int
+            Current repetition (including the repetitions in
+            `delta_sim_results`).
+        current_params : SimulationParameters
+            The current parameters.
+        delta_sim_results : SimulationResults
+            The results of the repetitions simulated since the last
+            checkpoint.
+        partial_results_filename : str
+            The name of the partial results file.
+        """
+        delta_sim_results.set_parameters(current_params)
+        log_filename = self._get_partial_results_log_filename(
+            partial_results_filename)
+        folder = os.path.dirname(log_filename)
+        if folder != '' and not os.path.isdir(folder):
+            os.mkdir(folder)
+        _append_to_checkpoint_log(log_filename,
+                                  (current_rep, delta_sim_results))
+
     def clear(self):  # pragma: no cover
         """
         Clear the SimulationRunner.
@@ -579,9 +1242,89 @@ class SimulationRunner(object):
         self._runned_reps = []
         self.results = SimulationResults()
 
-    def __run_simulation_and_track_elapsed_time(self, current_parameters):
+    def _set_rng(self, current_params, first_rep):
+        """
+        Set the `rng` attribute with the random number generator for the
+        repetitions of `current_params` starting at `first_rep`.
+
+        The generator is derived from the root SeedSequence of the
+        simulation using the unpack index of `current_params` and
+        `first_rep` as the spawn key. Therefore, each parameters variation
+        and each chunk of repetitions gets an independent generator, which
+        does not depend on which process simulates it.
+
+        Parameters
+        ----------
+        current_params : SimulationParameters
+            The current parameters.
+        first_rep : int
+            The index of the first repetition simulated with the
+            generator.
+        """
+        if self._seed_sequence is None:
+            self._seed_sequence = np.random.SeedSequence(self.rng_seed)
+
+        # The unpack_index is -1 if no parameter is unpacked
+        unpack_index = max(current_params.unpack_index, 0)
+        seed_sequence = np.random.SeedSequence(
+            self._seed_sequence.entropy,
+            spawn_key=self._seed_sequence.spawn_key + (unpack_index,
+                                                       first_rep))
+        self.rng = np.random.default_rng(seed_sequence)
+        self._rng_first_rep = first_rep
+
+    def _implements_batch_simulation(self):
+        """
+        Check if the `_run_simulation_batch` method is implemented.
+
+        Returns
+        -------
+        bool
+            True if `_run_simulation_batch` is implemented in a subclass.
+        """
+        return (type(self)._run_simulation_batch !=
+                SimulationRunner._run_simulation_batch)
+
+    def _get_next_batch_size(self, current_rep, last_rep, batch_size):
+        """
+        Get the number of repetitions that should be simulated in the next
+        call to `_run_simulation_batch`.
+
+        Parameters
+        ----------
+        current_rep : int
+            Number of repetitions already run.
+        last_rep : int
+            Number of repetitions after which the simulation stops.
+        batch_size : int
+            The desired batch size.
+
+        Returns
+        -------
+        int
+            The number of repetitions of the next batch. This is always 1
+            if `_run_simulation_batch` is not implemented.
+        """
+        if not self._implements_batch_simulation():
+            return 1
+
+        num_reps = min(batch_size, last_rep - current_rep)
+        # A batch never crosses a multiple of partial_results_save_reps
+        # repetitions, where partial results are saved, or the boundary of
+        # a chunk of repetitions, where the random number generator
+        # changes.
+        boundaries = [self.partial_results_save_reps]
+        if self.reps_per_chunk is not None:
+            boundaries.append(self.reps_per_chunk)
+        for boundary in boundaries:
+            num_reps = min(num_reps, boundary - current_rep % boundary)
+        return num_reps
+
+    def __run_simulation_and_track_elapsed_time(self, current_parameters,
+                                                num_reps=1):
         """
-        Perform the _run_simulation method and track its execution time.
+        Perform the _run_simulation method (or _run_simulation_batch, if it
+        is implemented) and track its execution time.
         This time will be added as a Result to the returned
         :class:`.SimulationResults` object from _run_simulation.
 
@@ -592,21 +1335,142 @@ class SimulationRunner(object):
             simulation. The self.params variable is not used directly. It
             is first unpacked in the simulate function which then calls
             _run_simulation for each combination of unpacked parameters.
+        num_reps : int
+            The number of repetitions. This must be 1 if
+            _run_simulation_batch is not implemented.
 
         Notes
         -----
         This method is called in the `simulate` and `simulate_in_parallel`.
         """
+        if self.stage_timing_enabled:
+            self._stage_times = {}
+
         tic = time()
-        current_sim_results = self._run_simulation(current_parameters)
+        if self._implements_batch_simulation():
+            current_sim_results = self._run_simulation_batch(
+                current_parameters, num_reps)
+        else:
+            current_sim_results = self._run_simulation(current_parameters)
         toc = time()
         elapsed_time_result = Result.create('elapsed_time',
                                             Result.SUMTYPE,
                                             toc - tic)
         current_sim_results.add_result(elapsed_time_result)
 
+        # Add the time spent in each stage of the simulation
+        if self._stage_times:
+            for name, (wall_time, cpu_time) in self._stage_times.items():
+                current_sim_results.add_new_result(
+                    STAGE_WALL_TIME_PREFIX + name, Result.SUMTYPE, wall_time)
+                current_sim_results.add_new_result(
+                    STAGE_CPU_TIME_PREFIX + name, Result.SUMTYPE, cpu_time)
+            self._stage_times = {}
+
         return current_sim_results
 
+    def timed(self, name):
+        """
+        Get a context manager that measures the wall and CPU time spent in
+        a stage of the simulation.
+
+        The times of each stage are accumulated over all repetitions of
+        each parameters variation and stored in the SUMTYPE results
+        'stage_wall_time:name' and 'stage_cpu_time:name'. This only
+        happens if the `stage_timing_enabled` attribute is True. Otherwise,
+        the returned context manager does nothing.
+
+        Parameters
+        ----------
+        name : str
+            The name of the stage.
+
+        Returns
+        -------
+        context manager
+            The context manager that times the stage.
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+           def _run_simulation(self, current_params):
+               with self.timed('channel'):
+                   channel = self._generate_channel(current_params)
+               with self.timed('demodulation'):
+                   ...
+
+        See Also
+        --------
+        timed_stage
+        """
+        if not self.stage_timing_enabled:
+            return _NULL_STAGE_TIMER
+        return _StageTimer(self._stage_times, name)
+
+    def _start_memory_probe(self):
+        """
+        Start measuring the memory, if the `memory_tracking_enabled`
+        attribute is True.
+
+        Returns
+        -------
+        _MemoryProbe | None
+            The memory probe, or None if memory tracking is disabled.
+        """
+        if not self.memory_tracking_enabled:
+            return None
+        return _MemoryProbe()
+
+    def _stop_memory_probe(self, memory_probe, num_reps,
+                           current_sim_results):
+        """
+        Stop measuring the memory and store the peak memory and the memory
+        growth per repetition in `current_sim_results`.
+
+        Parameters
+        ----------
+        memory_probe : _MemoryProbe | None
+            The memory probe returned by :meth:`_start_memory_probe`.
+        num_reps : int
+            The number of repetitions simulated since the probe started.
+        current_sim_results : SimulationResults
+            The results of the current parameters.
+        """
+        if memory_probe is None:
+            return
+        peak_memory, memory_growth = memory_probe.stop()
+        if num_reps == 0:
+            return
+        peak_memory_name, memory_growth_name = MEMORY_RESULT_NAMES
+        current_sim_results.add_new_result(peak_memory_name, Result.MISCTYPE,
+                                           peak_memory)
+        current_sim_results.add_new_result(memory_growth_name,
+                                           Result.MISCTYPE,
+                                           memory_growth / num_reps)
+
+    def _check_memory_budget(self, current_params, current_sim_results):
+        """
+        Call the :meth:`_on_memory_budget_exceeded` method if the peak
+        memory in `current_sim_results` is greater than the
+        `memory_budget` attribute.
+
+        Parameters
+        ----------
+        current_params : SimulationParameters
+            The current parameters.
+        current_sim_results : SimulationResults
+            The results of the current parameters.
+        """
+        peak_memory_name = MEMORY_RESULT_NAMES[0]
+        if (self.memory_budget is None or peak_memory_name
+                not in current_sim_results.get_result_names()):
+            return
+        peak_memory = current_sim_results[peak_memory_name][-1].get_result()
+        if peak_memory > self.memory_budget:
+            self._on_memory_budget_exceeded(current_params, peak_memory)
+
     def _run_simulation(self, current_parameters):
         """
         Performs one iteration of the simulation.
@@ -621,6 +1485,12 @@ class SimulationRunner(object):
         reimplementing the _keep_going function in the derived class) and
         the results from multiple repetitions will be merged.
 
+        Any random value should be generated with the `self.rng` generator
+        (it can be passed to the `randn_c` function and to the fading
+        generators, for instance). That makes the simulation reproducible
+        (see the `rng_seed` attribute) and the results of a parallel
+        simulation independent of the number of workers.
+
         Parameters
         ----------
         current_parameters : SimulationParameters
@@ -639,6 +1509,46 @@ class SimulationRunner(object):
         raise NotImplementedError("'_run_simulation' must be implemented "
                                   "in a subclass of SimulationRunner")
 
+    def _run_simulation_batch(self, current_parameters, num_reps):
+        """
+        Performs `num_reps` iterations of the simulation.
+
+        This method is optional. If it is implemented in a subclass, it is
+        called instead of `_run_simulation` and it should return the
+        results of `num_reps` iterations as a single
+        :class:`.SimulationResults` object, such as the one that would be
+        obtained by merging the results of `num_reps` calls to
+        `_run_simulation`. For cheap simulations this allows vectorizing
+        the computation of several iterations and avoids the overhead of
+        creating and merging the results of each iteration.
+
+        The number of repetitions starts at 1 and doubles after each call
+        (up to the `max_reps_per_batch` attribute). The `_keep_going`
+        method is called after each batch and partial results are saved
+        at batch boundaries.
+
+        Parameters
+        ----------
+        current_parameters : SimulationParameters
+            SimulationParameters object with the parameters for the
+            simulation.
+        num_reps : int
+            The number of iterations to perform.
+
+        Returns
+        -------
+        simulation_results : SimulationResults
+            A SimulationResults object containing the (aggregated)
+            simulation results of the `num_reps` iterations.
+
+        Notes
+        -----
+        If a SkipThisOne exception is raised, the whole batch is skipped
+        and counted as a single skipped repetition.
+        """
+        raise NotImplementedError(
+            "'_run_simulation_batch' is optional and it was not implemented")
+
     # pylint: disable=W0613,R0201
     def _keep_going(self,
                     current_params, current_sim_results, current_rep):
@@ -677,6 +1587,114 @@ class SimulationRunner(object):
         # maximum number of allowed iterations is reached.
         return True
 
+    def add_confidence_interval_stop_criterion(self, result_name,
+                                               max_relative_half_width=0.05,
+                                               P=95, min_updates=10):
+        """
+        Add a stop criterion based on the confidence interval of a result.
+
+        The simulation of each parameters variation stops when the
+        confidence interval of the result with name `result_name`, with
+        confidence `P`, has a half width (relative to the mean) smaller
+        than or equal to `max_relative_half_width`, or when `rep_max`
+        repetitions are run. If more than one stop criterion is added, the
+        simulation stops when all of them are satisfied.
+
+        This is checked (after each repetition) in addition to the
+        `_keep_going` method. Therefore, the simulation also stops if
+        `_keep_going` returns False. The number of repetitions run for each
+        parameters variation is stored in the `runned_reps` property.
+
+        Parameters
+        ----------
+        result_name : str
+            The name of the result returned by `_run_simulation`.
+        max_relative_half_width : float
+            The maximum half width of the confidence interval divided by
+            the mean of the result. For instance, 0.05 means that the true
+            value is within 5% of the estimated one (with confidence `P`).
+        P : float
+            The confidence (in %) of the interval. See
+            :meth:`.Result.get_confidence_interval` for the allowed values.
+        min_updates : int
+            The minimum number of updates of the result (usually, the
+            number of repetitions) before the criterion is checked. This
+            avoids stopping because of a bad variance estimate.
+
+        Examples
+        --------
+        Stop when the 95% confidence interval of the 'ber' result is within
+        5% of the estimated BER.
+
+        >>> runner = SimulationRunner(read_command_line_args=False)
+        >>> runner.add_confidence_interval_stop_criterion('ber', 0.05, P=95)
+        """
+        self._stop_criteria.append(
+            (result_name, max_relative_half_width, P, min_updates))
+
+    def _stop_criteria_reached(self, current_sim_results):
+        """
+        Check if all stop criteria added with the
+        `add_confidence_interval_stop_criterion` method are satisfied.
+
+        Parameters
+        ----------
+        current_sim_results : SimulationResults
+            The (merged) results of the current parameters.
+
+        Returns
+        -------
+        bool
+            True if there is at least one stop criterion and all of them
+            are satisfied, or False otherwise.
+        """
+        if not self._stop_criteria:
+            return False
+
+        for name, max_relative_half_width, P, min_updates in \
+                self._stop_criteria:
+            result = current_sim_results[name][-1]
+            if result.num_updates < min_updates:
+                return False
+            mean = result.get_result_mean()
+            if mean == 0:
+                # A relative width is not defined. This usually means that
+                # no error was found yet.
+                return False
+            lower, upper = result.get_confidence_interval(P)
+            if (upper - lower) / 2.0 > max_relative_half_width * abs(mean):
+                return False
+        return True
+
+    def _continue_simulation(self, current_params, current_sim_results,
+                             current_rep):
+        """
+        Check if the simulation of the current parameters should continue.
+
+        This combines the `_keep_going` method, the `rep_max` attribute and
+        the stop criteria added with the
+        `add_confidence_interval_stop_criterion` method.
+
+        Parameters
+        ----------
+        current_params : SimulationParameters
+            The current parameters.
+        current_sim_results : SimulationResults
+            SimulationResults object with the (merged) results of the
+            current parameters.
+        current_rep : int
+            Number of iterations already run.
+
+        Returns
+        -------
+        bool
+            True if the simulation should continue or False otherwise.
+        """
+        return (current_rep < self.rep_max and
+                self._keep_going(current_params, current_sim_results,
+                                 current_rep) and
+                not self._stop_criteria_reached(current_sim_results))
+
     def _get_serial_update_progress_function(
             self, current_params):  # pragma: no cover
         """
@@ -775,7 +1793,8 @@ class SimulationRunner(object):
         return update_progress_func
     # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
 
-    def _get_parallel_update_progress_function(self):  # pragma: no cover
+    def _get_parallel_update_progress_function(
+            self, local=False):  # pragma: no cover
         """
         Return a function that should be called to update the
         progressbar for the simulation of the current parameters.
@@ -788,10 +1807,19 @@ class SimulationRunner(object):
         # The progressbar used to get the returned function depend on the
         # value of the self.update_progress_function_style attribute.
 
+        Parameters
+        ----------
+        local : bool
+            If True, the simulation is performed by local worker processes
+            (see :class:`LocalProcessPoolView`) and a
+            ProgressbarMultiProcessServer is used instead of a
+            ProgressbarZMQServer.
+
         Returns
         -------
-        list[int,int]
-            List with the proxybar client_id, ip and port.
+        list[int,int] | ProgressbarMultiProcessClient
+            List with the proxybar client_id, ip and port. If `local` is
+            True, the proxy progressbar object itself is returned.
 
         Notes
         -----
@@ -804,7 +1832,12 @@ class SimulationRunner(object):
         based on current parameters.
         """
         if self.update_progress_function_style is not None:
-            if self._pbar is None:
+            if local is True:
+                pbar_class = ProgressbarMultiProcessServer
+            else:
+                pbar_class = ProgressbarZMQServer
+
+            if not isinstance(self._pbar, pbar_class):
                 parameters = self.params.parameters
                 # If the progressbar_message has any string replacements
                 #  in the form {some_param} where 'some_param' is a
@@ -821,20 +1854,26 @@ class SimulationRunner(object):
                     filename = '{0}_progress.txt'.format(
                         self._results_base_filename)
 
-                self._pbar = ProgressbarZMQServer(
+                self._pbar = pbar_class(
                     message=message,
                     sleep_time=sleep_time,
                     filename=filename,
                     **self.progressbar_extra_args)
 
             # Note that this will be an object of the ProgressbarZMQClient
-            # class, but it behaves like a function.
+            # (or ProgressbarMultiProcessClient) class, but it behaves like
+            # a function.
             proxybar = \
                 self._pbar.register_client_and_get_proxy_progressbar(
                     self.rep_max)
-            proxybar_data = [proxybar.client_id,
-                             proxybar.ip,
-                             proxybar.port]
+            if local is True:
+                # The ProgressbarMultiProcessClient object can be pickled
+                # and sent to the worker processes directly.
+                proxybar_data = proxybar
+            else:
+                proxybar_data = [proxybar.client_id,
+                                 proxybar.ip,
+                                 proxybar.port]
         else:
             return None
 
@@ -874,6 +1913,9 @@ class SimulationRunner(object):
         # pickled (uses ZMQ sockets).
         state = dict(self.__dict__)
         del state['_pbar']
+        # The object with the results of the parallel simulation cannot be
+        # pickled either and it is not needed by the workers.
+        state['_async_results'] = None
         return state
 
     # def get_runned_reps_fix_params(
@@ -921,91 +1963,111 @@ class SimulationRunner(object):
             SimulationResults object, and the name of the file storing
             partial results.
         """
+        # Name of the file where the partial results will be saved
+        partial_results_filename = self._get_partial_results_filename(
+            current_params)
+
+        # If the results of the current parameters are in the cache there
+        # is nothing to simulate.
+        cached = self._get_cached_results(current_params)
+        if cached is not None:
+            current_rep, current_sim_results = cached
+            update_progress_func(self.rep_max)
+            if partial_results_filename is not None:
+                self._save_partial_results(current_rep,
+                                           current_params,
+                                           current_sim_results,
+                                           partial_results_filename)
+            return current_rep, current_sim_results, partial_results_filename
+
+        # Measure the memory used to simulate the current parameters (if
+        # memory tracking is enabled)
+        memory_probe = self._start_memory_probe()
+
         # Implement the _on_simulate_current_params_start method in a
         # subclass if you need to run code before the _run_simulation
         # iterations for each combination of simulation parameters.
         self._on_simulate_current_params_start(current_params)
 
+        # Number of repetitions of the next _run_simulation_batch call (if
+        # it is implemented)
+        batch_size = 1
+
         # First we try to Load the partial results for the current
         # parameters.
         try:
-            # Name of the file where the partial results will be saved
-            if self._results_base_filename is not None:
-                partial_results_filename = get_partial_results_filename(
-                    self.results_base_filename,
-                    current_params,
-                    self.partial_results_folder)
-            else:
-                # If __results_base_filename is None there is also no
-                # partial results to load. Therefore, lets raise an
-                # IOError here to go to the except catching
-                raise IOError()
-
             # If loading partial results succeeds, then we will have
             # partial results. If it fails because the file does not
             # exist, this will thrown a IOError exception and we will
             # execute the except block instead.
-            current_sim_results = SimulationResults.load_from_file(
-                partial_results_filename)
-            num_skipped_reps_result = Result.create(
-                "num_skipped_reps", Result.SUMTYPE, 0)
-            current_sim_results.add_result(num_skipped_reps_result)
-
-            # Note that at this point we have successfully loaded the
-            # partial results from the file. However, we still need to
-            # make sure it matches our current parameters. It it does
-            # not match the user likely used a wrong name and we raise
-            # an exception to stop the simulation.
             #
-            # NOTE: If the type of this exception is changed in the
-            # future make sure it is not caught in the except block.
-            if not current_params == current_sim_results.params:
-                err_msg = (
-                    "Partial results loaded from file does not match"
-                    " current parameters. \nfile: {0}")
-                raise ValueError(err_msg.format(partial_results_filename))
-
-            # The current_rep will be set to the value or run
-            # repetitions in the loaded partial results. This means
-            # that the "while" statement after this try/except block
-            # will have a head start and if current_rep is greater than
-            # or equal to rep_max the while loop won't run at all.
-            # noinspection PyUnresolvedReferences
-            current_rep = current_sim_results.current_rep
+            # The current_rep will be set to the value or run repetitions
+            # in the loaded partial results. This means that the "while"
+            # statement after this try/except block will have a head start
+            # and if current_rep is greater than or equal to rep_max the
+            # while loop won't run at all.
+            current_rep, current_sim_results = self._load_partial_results(
+                current_params, partial_results_filename)
+            self._set_rng(current_params, current_rep)
+            first_rep = current_rep
+            # Results simulated since the last checkpoint
+            delta_sim_results = SimulationResults()
 
         # If loading partial results failed then we will run the FIRST
         # repetition here and the "while" statement after this
         # try/except block will run as usual.
         except IOError:
             # Perform the first iteration of _run_simulation
+            self._set_rng(current_params, 0)
+            first_rep = 0
             current_sim_results = \
                 self.__run_simulation_and_track_elapsed_time(
                     current_params)
+            # Results simulated since the last checkpoint. This is a copy,
+            # since current_sim_results is updated in place.
+            delta_sim_results = copy.deepcopy(current_sim_results)
             # Add the extra 'num_skipped_reps' Result.
             current_sim_results.add_new_result('num_skipped_reps',
                                                Result.SUMTYPE, 0)
             current_rep = 1
+            batch_size = min(2, self.max_reps_per_batch)
 
         last_tic = time()
         # Run more iterations until one of the stop criteria is
         # reached. Note that if partial results were loaded successfully
         # from file and they already achieve the stop criteria then the
         # while loop below will not run.
-        while (self._keep_going(current_params, current_sim_results,
-                                current_rep) and
-                current_rep < self.rep_max):
+        while self._continue_simulation(current_params, current_sim_results,
+                                        current_rep):
+            # Each chunk of reps_per_chunk repetitions uses its own random
+            # number generator, such as when the chunks are simulated by
+            # different workers.
+            if (self.reps_per_chunk is not None and
+                    current_rep % self.reps_per_chunk == 0 and
+                    current_rep != self._rng_first_rep):
+                self._set_rng(current_params, current_rep)
+                # Start again with small batches, as in a new chunk
+                batch_size = 1
+
             # xxxxxxxxxx Run one repetition of the simulation xxxxxxxxxxxxx
+            # This is always one, unless _run_simulation_batch is
+            # implemented
+            num_reps = self._get_next_batch_size(current_rep, self.rep_max,
+                                                 batch_size)
             try:
                 # Run one repetition of the `_run_simulation` and merge the
                 # new results. If `_run_simulation` raises a SkipThisOne
                 # exception, then we do not increase current_rep or the
                 # current progress, since there is no new result to merge.
-                current_sim_results.merge_all_results(
+                new_sim_results = \
                     self.__run_simulation_and_track_elapsed_time(
-                        current_params))
+                        current_params, num_reps)
+                current_sim_results.merge_all_results(new_sim_results)
+                delta_sim_results.merge_all_results(new_sim_results)
 
-                current_rep += 1
+                current_rep += num_reps
                 update_progress_func(current_rep)
+                batch_size = min(2 * batch_size, self.max_reps_per_batch)
             except SkipThisOne:
                 # Each time a SkipThisOne exception is raised we increase
                 # the num_skipped_reps_reps result to indicate that, but we
@@ -1019,20 +2081,28 @@ class SimulationRunner(object):
             # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
 
             toc = time()
-            # Save partial results each 500 iterations as well as each 5
-            # minutes
-            if ((toc - last_tic > 300 or current_rep % 500 == 0) and
-                    self._results_base_filename is not None):
-                self.__save_partial_results(current_rep,
-                                            current_params,
-                                            current_sim_results,
-                                            partial_results_filename)
+            # Append the new results to the checkpoint log each
+            # partial_results_save_reps iterations as well as each
+            # partial_results_save_interval seconds
+            if ((toc - last_tic > self.partial_results_save_interval or
+                 current_rep % self.partial_results_save_reps == 0) and
+                    partial_results_filename is not None and
+                    len(delta_sim_results) > 0):
+                self._append_partial_results(current_rep,
+                                             current_params,
+                                             delta_sim_results,
+                                             partial_results_filename)
+                delta_sim_results = SimulationResults()
                 last_tic = time()
 
         # If the while loop ended before rep_max repetitions (because
         # _keep_going returned false) then set the progressbar to full.
         update_progress_func(self.rep_max)
 
+        self._stop_memory_probe(memory_probe, current_rep - first_rep,
+                                current_sim_results)
+        self._check_memory_budget(current_params, current_sim_results)
+
         # Implement the _on_simulate_current_params_finish method in a
         # subclass if you need to run code after all _run_simulation
         # iterations for each combination of simulation parameters
@@ -1041,16 +2111,17 @@ class SimulationRunner(object):
                                                 current_sim_results)
 
         # xxxxxxxxxx Save partial results to file xxxxxxxxxxxxxxxxxxxxx
-        # Save partial results for current parameters after all repetitions
-        if self._results_base_filename is not None:
-            self.__save_partial_results(current_rep,
-                                        current_params,
-                                        current_sim_results,
-                                        partial_results_filename)
-        else:
-            partial_results_filename = None
+        # Save partial results for current parameters after all
+        # repetitions. This also compacts the checkpoint log.
+        if partial_results_filename is not None:
+            self._save_partial_results(current_rep,
+                                       current_params,
+                                       current_sim_results,
+                                       partial_results_filename)
         # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
 
+        self._cache_results(current_params, current_rep, current_sim_results)
+
         # This function returns a tuple containing the number of
         # iterations run as well as the SimulationResults object.
         return current_rep, current_sim_results, partial_results_filename
@@ -1098,11 +2169,14 @@ class SimulationRunner(object):
             that this method is set to static is to allow it to be pickled.
         current_params : SimulationParameters
             The current parameters
-        proxybar_data : (int,str,int) | None
+        proxybar_data : (int,str,int) | ProgressbarDistributedClientBase | None
                 The elements are the "client_id" (and int), the "ip" (a
                 string with an IP address) and the "port". This data should
                 be used to create a ProgressbarZMQClient object that can be
-                used to update the progressbar (via a ZMQ socket)
+                used to update the progressbar (via a ZMQ socket). This can
+                also be the proxy progressbar object itself, which is the
+                case when the simulation is performed with a
+                :class:`LocalProcessPoolView`.
 
         Returns
         -------
@@ -1111,22 +2185,140 @@ class SimulationRunner(object):
             SimulationResults object, and the name of the file storing
             partial results.
         """
+        update_progress_func = \
+            SimulationRunner._get_update_progress_func_from_proxybar_data(
+                proxybar_data)
+
+        # pylint: disable= W0212
+        # noinspection PyProtectedMember
+        return obj._simulate_for_current_params_common(
+            current_params, update_progress_func)
+
+    @staticmethod
+    def _get_update_progress_func_from_proxybar_data(
+            proxybar_data):  # pragma: no cover
+        """
+        Get the function to update the progress from the data returned by
+        the `_get_parallel_update_progress_function` method.
+
+        Parameters
+        ----------
+        proxybar_data : (int,str,int) | ProgressbarDistributedClientBase | None
+            The proxy progressbar data.
+
+        Returns
+        -------
+        func : (int) -> []
+            A function that accepts a single integer argument and can be
+            called to update the progressbar.
+        """
         from pyphysim.simulations.progressbar import ProgressbarZMQClient
 
-        # xxxxxxxxxx Function to update the progress xxxxxxxxxxxxxxxxxx
         if proxybar_data is None:
             def update_progress_func(_):
                 pass
+        elif isinstance(proxybar_data, ProgressbarDistributedClientBase):
+            update_progress_func = proxybar_data.progress
         else:
             client_id, ip, port = proxybar_data  # pylint: disable=W0633
             proxybar = ProgressbarZMQClient(client_id, ip, port)
             update_progress_func = proxybar.progress
-        # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
 
+        return update_progress_func
+
+    def _simulate_chunk(self, current_params, num_reps, first_rep):
+        """
+        Simulate a chunk of `num_reps` repetitions for the current
+        parameters.
+
+        Contrary to the `_simulate_for_current_params_common` method,
+        partial results are neither loaded nor saved and the `_keep_going`
+        method is not called, since the stop criteria is checked (by the
+        main process) after the results of all chunks of the current
+        parameters are merged.
+
+        Parameters
+        ----------
+        current_params : SimulationParameters
+            The current parameters
+        num_reps : int
+            The number of repetitions to simulate.
+        first_rep : int
+            The index of the first repetition of the chunk.
+
+        Returns
+        -------
+        (int, SimulationResults)
+            The number of simulated repetitions (equal to `num_reps`) and
+            the merged results of these repetitions.
+        """
+        memory_probe = self._start_memory_probe()
+        self._set_rng(current_params, first_rep)
+        current_sim_results = SimulationResults()
+        num_skipped_reps = 0
+        current_rep = 0
+        batch_size = 1
+        while current_rep < num_reps:
+            # The repetitions are counted from the start of the simulation
+            # of current_params, since the batches cannot cross the
+            # boundaries computed in _get_next_batch_size.
+            batch_num_reps = self._get_next_batch_size(
+                first_rep + current_rep, first_rep + num_reps, batch_size)
+            try:
+                current_sim_results.merge_all_results(
+                    self.__run_simulation_and_track_elapsed_time(
+                        current_params, batch_num_reps))
+                current_rep += batch_num_reps
+                batch_size = min(2 * batch_size, self.max_reps_per_batch)
+            except SkipThisOne:
+                num_skipped_reps += 1
+
+        current_sim_results.add_new_result('num_skipped_reps',
+                                           Result.SUMTYPE,
+                                           num_skipped_reps)
+        # When the chunks are merged the largest memory usage is kept
+        self._stop_memory_probe(memory_probe, current_rep,
+                                current_sim_results)
+        return current_rep, current_sim_results
+
+    # This method is run in another process. See the comment in the
+    # _simulate_for_current_params_parallel method.
+    @staticmethod
+    def _simulate_chunk_parallel(obj, current_params, num_reps,
+                                 first_rep):  # pragma: no cover
+        """
+        Simulate (parallel) a chunk of repetitions for the current
+        parameters.
+
+        This is used by the simulate_in_parallel method when the
+        `reps_per_chunk` attribute is not None.
+
+        Parameters
+        ----------
+        obj : SimulationRunner
+            The same as the self parameter in regular methods. The reason
+            that this method is set to static is to allow it to be pickled.
+        current_params : SimulationParameters
+            The current parameters
+        num_reps : int
+            The number of repetitions to simulate.
+        first_rep : int
+            The index of the first repetition of the chunk.
+
+        Returns
+        -------
+        (int, SimulationResults)
+            The number of simulated repetitions and the merged results of
+            these repetitions.
+        """
+        # Since each chunk can be simulated in a different worker, the
+        # _on_simulate_current_params_start method is called for each
+        # chunk.
         # pylint: disable= W0212
         # noinspection PyProtectedMember
-        return obj._simulate_for_current_params_common(
-            current_params, update_progress_func)
+        obj._on_simulate_current_params_start(current_params)
+        # noinspection PyProtectedMember
+        return obj._simulate_chunk(current_params, num_reps, first_rep)
 
     def __get_print_variation_iterator(self, num_variations, start=0):
         """
@@ -1168,7 +2360,7 @@ class SimulationRunner(object):
                 print()  # print a new line
                 yield i
 
-    def simulate(self, param_variation_index=None):
+    def simulate(self, param_variation_index=None, workers=None):
         """
         Performs the full Monte Carlo simulation (serially).
 
@@ -1191,19 +2383,155 @@ class SimulationRunner(object):
             case, calling the set_results_filename method before the
             simulate method is required since only the partial results will
             be saved.
+        workers : int, optional
+            If provided (and `param_variation_index` is not), the different
+            parameters variations are simulated in parallel by `workers`
+            local worker processes instead of serially. This is equivalent
+            to calling :meth:`simulate_in_parallel` with a
+            :class:`LocalProcessPoolView` and does not require an IPython
+            cluster.
 
         See Also
         --------
-        simulate_in_parallel
+        simulate_in_parallel, iter_simulate
         """
-        if param_variation_index is not None:  # pragma: no cover
-            # Maybe even though param_variation_index is a valid integer it
-            # was passed as a string. Let's try to convert whatever we have
-            # to an integer.
-            param_variation_index = int(param_variation_index)
+        if workers is not None and param_variation_index is None:
+            view = LocalProcessPoolView(workers)
+            try:
+                self.simulate_in_parallel(view, wait=True)
+            finally:
+                view.close()
+            return
+
+        if param_variation_index is None:
+            # Loop through all the parameters combinations
+            for _ in self.__iter_simulate_serial():
+                pass
+            return
+
+        # Maybe even though param_variation_index is a valid integer it was
+        # passed as a string. Let's try to convert whatever we have to an
+        # integer.
+        param_variation_index = int(param_variation_index)
+
+        self.__start_simulation()
+
+        # Get the number of variations of the transmit parameters
+        num_variations = self.params.get_num_unpacked_variations()
+
+        # Create the var_print_iter Iterator
+        # Each time the 'next' method of var_print_iter is called it will
+        # print something like
+        # ------------- Current Variation: 4/84 ------------
+        # which means the variation 4 of 84 variations.
+
+        # However, this will only be printed if
+        # self.progress_output_type is equal to 'screen'
+        var_print_iter = self.__get_print_variation_iterator(
+            num_variations,
+            start=param_variation_index)
+
+        # Here we simulate for a single combination of parameters
+        if self._results_base_filename is None:
+            err_msg = ('The results filename must be set before'
+                       ' calling the "simulate" method.')
+            raise RuntimeError(err_msg)
+        param_comb_list = self.params.get_unpacked_params_list()
 
+        if 0 <= param_variation_index < len(param_comb_list):
+            current_params = param_comb_list[param_variation_index]
+            self._simulate_for_current_params_serial(current_params,
+                                                     var_print_iter)
+
+    def iter_simulate(self, workers=None, view=None, flush_results=False):
+        """
+        Performs the full Monte Carlo simulation yielding the results of
+        each parameters variation as soon as it is finished.
+
+        This is a generator that is equivalent to the :meth:`simulate`
+        method (or to the :meth:`simulate_in_parallel` method if `workers`
+        or `view` is provided), but the results of each parameters
+        variation can be used (plotted, for instance) before the other
+        variations are finished. Once the generator is exhausted the
+        `results` attribute has the results of all variations, as after
+        calling the :meth:`simulate` method.
+
+        Parameters
+        ----------
+        workers : int, optional
+            If provided, the parameters variations are simulated in
+            parallel by `workers` local worker processes.
+        view : LoadBalancedView | LocalProcessPoolView, optional
+            If provided, the parameters variations are simulated in
+            parallel by the workers of `view`. The view must have the
+            `apply_async` method and assign each task to a single worker.
+        flush_results : bool
+            If True, the results of the variations finished so far are
+            saved to the results file (see :meth:`set_results_filename`)
+            each time a variation finishes. The variations that are not
+            finished yet have empty :class:`.Result` objects (with zero
+            updates) and zero runned repetitions in the saved results.
+
+        Yields
+        ------
+        (SimulationParameters, SimulationResults)
+            The parameters and the results of a finished variation. In a
+            parallel simulation the variations are yielded in the order
+            they finish.
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+           for current_params, current_results in runner.iter_simulate(
+                   workers=4):
+               print(current_params['SNR'],
+                     current_results['ber'][-1].get_result())
+        """
+        if flush_results and self._results_base_filename is None:
+            raise RuntimeError('The results filename must be set to flush'
+                               ' the results.')
+
+        if workers is None and view is None:
+            for item in self.__iter_simulate_serial(flush_results):
+                yield item
+            return
+
+        close_view = view is None
+        if close_view:
+            view = LocalProcessPoolView(workers)
+        try:
+            self._start_simulation_in_parallel(view, stream=True)
+            params_list = self.params.get_unpacked_params_list()
+            finished = [None] * len(params_list)
+            # noinspection PyUnresolvedReferences
+            for position, (current_rep, current_sim_results, _) in \
+                    self._async_results.iter_finished():
+                if self._variations_order is None:
+                    index = position
+                else:
+                    index = self._variations_order[position]
+                finished[index] = (current_rep, current_sim_results)
+                if flush_results:
+                    self.__save_finished_results(finished)
+                yield params_list[index], current_sim_results
+
+            self.wait_parallel_simulation()
+        finally:
+            if close_view:
+                view.close()
+
+    def __start_simulation(self):
+        """
+        Initialize the simulation of all parameters variations.
+
+        This stores the `rep_max` attribute and the parameters in the
+        `results` attribute and calls the :meth:`_on_simulate_start` method.
+        """
         # xxxxxxxxxxxxxxx Some initialization xxxxxxxxxxxxxxxxxxxxxxxxxxxxx
         self.__tic = time()
+        self._seed_sequence = np.random.SeedSequence(self.rng_seed)
         # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
 
         # xxxxx Store rep_max in the results object xxxxxxxxxxxxxxxxxxxxxxx
@@ -1224,12 +2552,27 @@ class SimulationRunner(object):
         self._on_simulate_start()
         # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
 
+    def __iter_simulate_serial(self, flush_results=False):
+        """
+        Simulate (serially) all parameters variations, yielding the results
+        of each variation when it is finished.
+
+        Parameters
+        ----------
+        flush_results : bool
+            If True, save the results of the finished variations after
+            each variation (see :meth:`iter_simulate`).
+
+        Yields
+        ------
+        (SimulationParameters, SimulationResults)
+            The parameters and the results of each variation.
+        """
+        self.__start_simulation()
+
         # Get the number of variations of the transmit parameters
         num_variations = self.params.get_num_unpacked_variations()
 
-        # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
-        # xxxxx Start of the code unique to the serial version xxxxxxxxxxxx
-        # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
         # Create the var_print_iter Iterator
         # Each time the 'next' method of var_print_iter is called it will
         # print something like
@@ -1238,72 +2581,281 @@ class SimulationRunner(object):
 
         # However, this will only be printed if
         # self.progress_output_type is equal to 'screen'
-        if param_variation_index is None:
-            var_print_iter = self.__get_print_variation_iterator(
-                num_variations)
-        else:
-            var_print_iter = self.__get_print_variation_iterator(
-                num_variations,
-                start=param_variation_index)
+        var_print_iter = self.__get_print_variation_iterator(num_variations)
+
+        finished = [None] * num_variations
+        # xxxxx FOR UNPACKED PARAMETERS xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+        # Loop through all the parameters combinations
+        for index, current_params in enumerate(
+                self.params.get_unpacked_params_list()):
+            (current_rep, current_sim_results, _) \
+                = self._simulate_for_current_params_serial(
+                    current_params, var_print_iter)
+
+            # Store the number of repetitions actually ran for the
+            # current parameters combination
+            self._runned_reps.append(current_rep)
+            # Lets append the simulation results for the current
+            # parameters
+            self.results.append_all_results(current_sim_results)
+
+            finished[index] = (current_rep, current_sim_results)
+            if flush_results:
+                self.__save_finished_results(finished)
+            yield current_params, current_sim_results
         # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
 
-        # Here we can either simulate for a single combination of
-        # parameters, if param_variation_index was provided, or for all
-        # combinations if it is not provided.
-        if param_variation_index is not None:
-            if self._results_base_filename is None:
-                err_msg = ('The results filename must be set before'
-                           ' calling the "simulate" method.')
-                raise RuntimeError(err_msg)
-            param_comb_list = self.params.get_unpacked_params_list()
-
-            if 0 <= param_variation_index < len(param_comb_list):
-                current_params = param_comb_list[param_variation_index]
-                self._simulate_for_current_params_serial(current_params,
-                                                         var_print_iter)
-
-        # If param_variation_index is None we will run for all parameters
-        # combinations
-        else:
-            # xxxxx FOR UNPACKED PARAMETERS xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
-            # Loop through all the parameters combinations
-            for current_params in self.params.get_unpacked_params_list():
-                (current_rep, current_sim_results, _) \
-                    = self._simulate_for_current_params_serial(
-                        current_params, var_print_iter)
-
-                # Store the number of repetitions actually ran for the
-                # current parameters combination
-                self._runned_reps.append(current_rep)
-                # Lets append the simulation results for the current
-                # parameters
-                self.results.append_all_results(current_sim_results)
-            # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+        # Implement the _on_simulate_finish method in a subclass if you
+        # need to run code at the end of the simulate method.
+        self._on_simulate_finish()
 
-            # Implement the _on_simulate_finish method in a subclass if you
-            # need to run code at the end of the simulate method.
-            self._on_simulate_finish()
+        # xxxxxxx Save the number of runned iterations xxxxxxxxxxxxxxxxxxxx
+        self.results.runned_reps = self._runned_reps
+        # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
 
-            # xxxxxxx Save the number of runned iterations xxxxxxxxxxxxxxxx
-            self.results.runned_reps = self._runned_reps
-            # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+        # xxxxx Update the elapsed time xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+        self.__toc = time()
+        self._elapsed_time = self.__toc - self.__tic
 
-            # xxxxx Update the elapsed time xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
-            self.__toc = time()
-            self._elapsed_time = self.__toc - self.__tic
+        # Also save the elapsed time in the SimulationResults object
+        self.results.elapsed_time = self._elapsed_time
+        # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
 
-            # Also save the elapsed time in the SimulationResults object
-            self.results.elapsed_time = self._elapsed_time
-            # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+        # xxxxx Save the results if results_filename is not None xxxxxxxxxx
+        if self._results_base_filename is not None:
+            self.results.save_to_file(self._results_base_filename)
+            # Delete the partial results (this will only delete the
+            # partial results if self.delete_partial_results_bool is True)
+            self.__delete_partial_results_maybe()
+        # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
 
-            # xxxxx Save the results if results_filename is not None xxxxxx
-            if self._results_base_filename is not None:
-                self.results.save_to_file(self._results_base_filename)
-                # Delete the partial results (this will only delete the
-                # partial results if self.delete_partial_results_bool is
-                # True)
-                self.__delete_partial_results_maybe()
-            # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+    @staticmethod
+    def _get_empty_results(sim_results):
+        """
+        Get a SimulationResults object with an empty Result object (with
+        zero updates) for each result in `sim_results`.
+
+        Parameters
+        ----------
+        sim_results : SimulationResults
+            The results used as a template.
+
+        Returns
+        -------
+        SimulationResults
+            The empty results.
+        """
+        empty_results = SimulationResults()
+        for name in sim_results.get_result_names():
+            result = sim_results[name][-1]
+            choice_num = None
+            if result.type_code == Result.CHOICETYPE:
+                choice_num = len(result.get_result())
+            empty_results.add_result(
+                Result(name, result.type_code,
+                       accumulate_values=result.accumulate_values_bool,
+                       choice_num=choice_num))
+        return empty_results
+
+    def __save_finished_results(self, finished):
+        """
+        Save the results of the variations finished so far to the results
+        file.
+
+        Parameters
+        ----------
+        finished : list[(int, SimulationResults) | None]
+            The number of repetitions and the results of each variation,
+            or None for the variations that are not finished.
+        """
+        empty_results = None
+        for item in finished:
+            if item is not None:
+                empty_results = self._get_empty_results(item[1])
+                break
+
+        results = SimulationResults()
+        results.set_parameters(self.params)
+        results.rep_max = self.rep_max
+        runned_reps = []
+        for item in finished:
+            if item is None:
+                runned_reps.append(0)
+                results.append_all_results(empty_results)
+            else:
+                runned_reps.append(item[0])
+                results.append_all_results(item[1])
+        results.runned_reps = runned_reps
+        results.save_to_file(self._results_base_filename)
+
+    @staticmethod
+    def _get_variation_key(current_params, unpacked_parameters):
+        """
+        Get a key that identifies a parameters variation by the values of
+        its unpacked parameters.
+
+        Parameters
+        ----------
+        current_params : SimulationParameters
+            The (unpacked) parameters of one variation.
+        unpacked_parameters : list[str]
+            The names of the unpacked parameters.
+
+        Returns
+        -------
+        tuple
+            Tuple with the values of the unpacked parameters.
+        """
+        return tuple(current_params[name] for name in unpacked_parameters)
+
+    def _get_variations_cost_from_previous_results(self, params_list):
+        """
+        Estimate the cost of each parameters variation from the results of
+        a previous simulation stored in the results file.
+
+        The cost of a variation is the elapsed time per repetition times
+        the expected number of repetitions, which is the number of
+        repetitions of the previous simulation if it stopped before its
+        `rep_max` (due to some stop criteria) or the current `rep_max`
+        otherwise. Variations that are not in the previous results (new
+        points in the sweep) get the maximum cost of the other ones.
+
+        Parameters
+        ----------
+        params_list : list[SimulationParameters]
+            The unpacked parameters of each variation.
+
+        Returns
+        -------
+        list[float] | None
+            The estimated cost of each variation, or None if there are no
+            previous results to get the costs from.
+        """
+        if self._results_base_filename is None:
+            return None
+
+        try:
+            previous_results = SimulationResults.load_from_file(
+                self.results_filename)
+            previous_params_list = \
+                previous_results.params.get_unpacked_params_list()
+            elapsed_time_results = previous_results['elapsed_time']
+            previous_runned_reps = previous_results.runned_reps
+        except (IOError, KeyError, AttributeError):
+            return None
+
+        unpacked_parameters = self.params.unpacked_parameters
+        if (previous_results.params.unpacked_parameters !=
+                unpacked_parameters or
+                previous_runned_reps is None or
+                len(previous_runned_reps) != len(previous_params_list)):
+            return None  # pragma: no cover
+        previous_rep_max = getattr(previous_results, 'rep_max', None)
+
+        previous_costs = {}
+        for previous_params, elapsed_time, reps in zip(
+                previous_params_list, elapsed_time_results,
+                previous_runned_reps):
+            # Variations that were not finished (see iter_simulate) have
+            # empty results
+            if elapsed_time.num_updates == 0:
+                continue
+            if previous_rep_max is not None and reps < previous_rep_max:
+                expected_reps = reps
+            else:
+                expected_reps = self.rep_max
+            cost = elapsed_time.get_result() / max(reps, 1) * expected_reps
+            key = self._get_variation_key(previous_params,
+                                          unpacked_parameters)
+            previous_costs[key] = cost
+
+        costs = []
+        for current_params in params_list:
+            key = self._get_variation_key(current_params,
+                                          unpacked_parameters)
+            costs.append(previous_costs.get(key))
+        known_costs = [c for c in costs if c is not None]
+        if not known_costs:
+            return None
+        max_cost = max(known_costs)
+        return [max_cost if c is None else c for c in costs]
+
+    # This method is run in another process. See the comment in the
+    # _simulate_for_current_params_parallel method.
+    @staticmethod
+    def _calibrate_variation(obj, current_params,
+                             num_reps):  # pragma: no cover
+        """
+        Estimate the cost of simulating the variation with the current
+        parameters.
+
+        The `_run_simulation` method is called `num_reps` times (and the
+        results are discarded) to measure the elapsed time per repetition.
+
+        Parameters
+        ----------
+        obj : SimulationRunner
+            The same as the self parameter in regular methods. The reason
+            that this method is set to static is to allow it to be pickled.
+        current_params : SimulationParameters
+            The current parameters
+        num_reps : int
+            The number of repetitions to run.
+
+        Returns
+        -------
+        float
+            The estimated cost, which is the elapsed time per repetition
+            times `rep_max`.
+        """
+        # pylint: disable=W0212
+        obj._on_simulate_current_params_start(current_params)
+        obj._set_rng(current_params, 0)
+        tic = time()
+        for _ in range(num_reps):
+            try:
+                # noinspection PyProtectedMember
+                obj.__run_simulation_and_track_elapsed_time(
+                    current_params)
+            except SkipThisOne:
+                pass
+        return (time() - tic) / num_reps * obj.rep_max
+
+    def _get_variations_order(self, view, params_list):  # pragma: no cover
+        """
+        Get the order in which the parameters variations should be
+        submitted in the simulate_in_parallel method.
+
+        Parameters
+        ----------
+        view : LoadBalancedView | DirectView | LocalProcessPoolView
+            The view used to run the calibration pass (if needed).
+        params_list : list[SimulationParameters]
+            The unpacked parameters of each variation.
+
+        Returns
+        -------
+        list[int] | None
+            The indexes of the variations ordered by decreasing expected
+            cost, or None if the variations should be submitted in the
+            original order.
+        """
+        if not self.cost_aware_scheduling:
+            return None
+
+        costs = self._get_variations_cost_from_previous_results(params_list)
+        if costs is None and self.calibration_reps > 0:
+            costs = view.map(SimulationRunner._calibrate_variation,
+                             [self] * len(params_list),
+                             params_list,
+                             [self.calibration_reps] * len(params_list),
+                             block=True)
+        if costs is None:
+            return None
+
+        # Sorting is stable, so variations with the same cost keep their
+        # original order
+        return sorted(range(len(params_list)), key=lambda i: -costs[i])
 
     # The unittests for this method only run if an ipython cluster is
     # started with a profile called "tests".
@@ -1314,8 +2866,8 @@ class SimulationRunner(object):
 
         Parameters
         ----------
-        view : LoadBalancedView | DirectView
-            A ´view´ of the IPython engines.
+        view : LoadBalancedView | DirectView | LocalProcessPoolView
+            A ´view´ of the IPython engines (or of local worker processes).
             The parallel processing will happen by calling the 'map' method
             of the provided view to simulate in parallel the different
             configurations of transmission parameters.
@@ -1328,6 +2880,16 @@ class SimulationRunner(object):
 
         Notes
         -----
+        By default each parameters variation is simulated by a single
+        worker. If the `reps_per_chunk` attribute is set to an integer,
+        the repetitions of each parameters variation are split into chunks
+        of `reps_per_chunk` repetitions that are simulated by different
+        workers. The results of the chunks are merged (in order) by the
+        main process, which also checks the `_keep_going` stop criteria
+        and saves the partial results after each merged chunk. This is
+        useful when there are fewer parameters variations than workers or
+        when some variations take much longer to simulate than others.
+
         There is a limitation regarding the partial simulation results. The
         partial results files will be saved in the folder where the IPython
         engines are running, since the "saving part" is performed in an
@@ -1337,28 +2899,35 @@ class SimulationRunner(object):
         same folder where the main python program will be run the partial
         result files won't be automatically deleted after the simulation is
         finished.
+
+        See Also
+        --------
+        iter_simulate
         """
-        # xxxxxxxxxxxxxxx Some initialization xxxxxxxxxxxxxxxxxxxxxxxxxxxxx
-        self.__tic = time()
-        # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+        self._start_simulation_in_parallel(view)
 
-        # xxxxx Store rep_max in the results object xxxxxxxxxxxxxxxxxxxxxxx
-        self.results.rep_max = self.rep_max  # pylint: disable=W0201
-        # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+        if wait is True:
+            self.wait_parallel_simulation()
 
-        # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
-        # Store the Simulation parameters in the SimulationResults object.
-        # With this, the simulation parameters will be available for
-        # someone that has the SimulationResults object (loaded from a
-        # file, for instance).
-        self.results.set_parameters(self.params)
-        # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+    def _start_simulation_in_parallel(self, view,
+                                      stream=False):  # pragma: no cover
+        """
+        Start the parallel simulation of all parameters variations.
 
-        # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
-        # Implement the _on_simulate_start method in a subclass if you need
-        # to run code at the start of the simulate method.
-        self._on_simulate_start()
-        # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+        The simulation can be finished by calling the
+        :meth:`wait_parallel_simulation` method.
+
+        Parameters
+        ----------
+        view : LoadBalancedView | DirectView | LocalProcessPoolView
+            A ´view´ of the IPython engines (or of local worker processes).
+        stream : bool
+            If True, each parameters variation is submitted as a separated
+            task (with the `apply_async` method of the view), such that the
+            `iter_finished` method of the `_async_results` attribute can
+            yield each variation as soon as it is finished.
+        """
+        self.__start_simulation()
 
         # Get the number of variations of the transmit parameters
         num_variations = self.params.get_num_unpacked_variations()
@@ -1369,39 +2938,62 @@ class SimulationRunner(object):
 
         # xxxxxxxxxx Progressbar for the parallel simulation xxxxxxxxxxxxxx
         if self.update_progress_function_style is not None:  # pragma: no cover
+            # Local worker processes can update a progressbar based on the
+            # multiprocessing module, while IPython engines (possibly in
+            # other machines) require a progressbar based on ZMQ sockets.
+            local = isinstance(view, LocalProcessPoolView)
             # Create the proxy progressbars
             proxybar_data_list = []
             for _ in range(num_variations):
                 proxybar_data_list.append(
-                    self._get_parallel_update_progress_function())
+                    self._get_parallel_update_progress_function(local))
         else:  # self.update_progress_function_style is None
             # Create the dummy update progress functions
             proxybar_data_list = [None] * num_variations
         # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
 
+        # xxxxxxxxxx Order of the variations xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+        # The variations expected to take longer are submitted first (if
+        # the cost can be estimated). Since the view dispatches the next
+        # variation whenever a worker is free, this reduces the total
+        # simulation time. The results are put back in the original order
+        # in the wait_parallel_simulation method.
+        params_list = self.params.get_unpacked_params_list()
+        self._variations_order = self._get_variations_order(view,
+                                                            params_list)
+        if self._variations_order is not None:
+            params_list = [params_list[i] for i in self._variations_order]
+        # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+
         # xxx Perform the actual simulation in asynchronously parallel xxxx
         # NOTE: If this fails because of some pickling error, make sure the
         # class of 'self' (that is, the subclass of SimulationRunner that
         # you are trying to run) is pickle-able.
-        self._async_results = view.map(
-            # simulate_for_current_params,
-            SimulationRunner._simulate_for_current_params_parallel,
-            # We need to pass the SimulationRunner
-            # object to the IPython engine ...
-            [self] * num_variations,
-            # ... and we also need to pass the
-            # simulation parameters for each engine
-            self.params.get_unpacked_params_list(),
-            proxybar_data_list,
-            block=False)
+        if self.reps_per_chunk is None and not stream:
+            self._async_results = view.map(
+                # simulate_for_current_params,
+                SimulationRunner._simulate_for_current_params_parallel,
+                # We need to pass the SimulationRunner
+                # object to the IPython engine ...
+                [self] * num_variations,
+                # ... and we also need to pass the
+                # simulation parameters for each engine
+                params_list,
+                proxybar_data_list,
+                block=False)
+        elif self.reps_per_chunk is None:
+            self._async_results = _VariationsParallelSimulation(
+                self, view, params_list, proxybar_data_list)
+        else:
+            # The repetitions of each variation are split into chunks
+            # that are simulated by different workers.
+            self._async_results = _ChunkedParallelSimulation(
+                self, view, params_list, proxybar_data_list)
         # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
 
         if self._pbar is not None:  # pragma: no cover
             self._pbar.start_updater()
 
-        if wait is True:
-            self.wait_parallel_simulation()
-
     def wait_parallel_simulation(self):  # pragma: no cover
         """
         Wait for the parallel simulation to finish and then update the
@@ -1415,6 +3007,14 @@ class SimulationRunner(object):
             self._async_results.wait()
 
             results = self._async_results.get()
+            # Put the results back in the original order of the variations
+            if self._variations_order is not None:
+                ordered_results = [None] * len(results)
+                for position, index in enumerate(self._variations_order):
+                    ordered_results[index] = results[position]
+                results = ordered_results
+                self._variations_order = None
+
             for reps, r, filename in results:
                 self._runned_reps.append(reps)
                 self.results.append_all_results(r)
@@ -1438,7 +3038,7 @@ class SimulationRunner(object):
 
             # xxxxx Save the results if results_base_filename is not None x
             if self._results_base_filename is not None:
-                self.results.save_to_file(self.results_base_filename)
+                self.results.save_to_file(self._results_base_filename)
                 # Delete the partial results (this will only delete the
                 # partial results if self.delete_partial_results_bool is
                 #  True)
@@ -1514,4 +3114,426 @@ class SimulationRunner(object):
         are only used inside _run_simulation.
         """
         pass
+
+    def _on_memory_budget_exceeded(self, current_params, peak_memory):
+        """This method is called when the peak memory used to simulate a
+        parameters variation is greater than the `memory_budget` attribute
+        (see the `memory_tracking_enabled` attribute).
+
+        The default implementation issues a RuntimeWarning. Implement this
+        method in a subclass to change that (to log the variation, for
+        instance).
+
+        Parameters
+        ----------
+        current_params : SimulationParameters
+            The current combination of simulation parameters.
+        peak_memory : int
+            The peak memory (in bytes) used to simulate the current
+            parameters.
+        """
+        msg = ("Peak memory of {0} bytes exceeded the memory budget of {1}"
+               " bytes for the parameters {2}")
+        warnings.warn(msg.format(peak_memory, self.memory_budget,
+                                 current_params.parameters),
+                      RuntimeWarning)
 # xxxxxxxxxx SimulationRunner - END xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+
+
+# xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+# xxxxxxxxxxxxxxx _ChunkedParallelSimulation - START xxxxxxxxxxxxxxxxxxxxxx
+# xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+class _ChunkedParallelSimulation(object):  # pragma: no cover
+    """
+    Schedule the chunks of repetitions of all parameters variations in the
+    workers of a view and merge their results.
+
+    This is used by the :meth:`SimulationRunner.simulate_in_parallel`
+    method when the `reps_per_chunk` attribute of the runner is not
+    None. Objects of this class have the `wait` and `get` methods, such as
+    the object returned by the `map` method of a view, so that they can be
+    stored in the `_async_results` attribute of the runner.
+
+    The results of the chunks of each variation are merged in the order
+    the chunks were created (regardless of the order they finish) and the
+    stop criteria of the runner (the `_keep_going` method and any
+    confidence interval stop criterion) are checked after each
+    merge. Once the stop criteria is reached for one variation no new chunk is
+    created for it and the results of any chunk still running for it are
+    discarded.
+
+    Parameters
+    ----------
+    runner : SimulationRunner
+        The simulation runner.
+    view : LoadBalancedView | DirectView | LocalProcessPoolView
+        The view used to run the chunks. It must have the `apply_async`
+        method.
+    params_list : list[SimulationParameters]
+        The unpacked parameters of each variation.
+    proxybar_data_list : list
+        The proxy progressbar data of each variation (see
+        `SimulationRunner._get_parallel_update_progress_function`).
+    """
+    # Maximum time (in seconds) waiting for a single chunk before checking
+    # the other ones.
+    _poll_interval = 0.05
+
+    def __init__(self, runner, view, params_list, proxybar_data_list):
+        self._runner = runner
+        self._view = view
+        # Keep (at most) one chunk for each worker in the view
+        self._max_pending = max(len(view), 1)
+        # List of (variation_index, chunk_index, async_result) tuples
+        self._pending = []
+
+        self._variations = []
+        for current_params, proxybar_data in zip(params_list,
+                                                 proxybar_data_list):
+            # pylint: disable=W0212
+            filename = runner._get_partial_results_filename(current_params)
+            cached = runner._get_cached_results(current_params)
+            if cached is not None:
+                current_rep, current_sim_results = cached
+            else:
+                try:
+                    current_rep, current_sim_results = \
+                        runner._load_partial_results(current_params,
+                                                     filename)
+                except IOError:
+                    current_rep, current_sim_results = 0, None
+
+            variation = {
+                'params': current_params,
+                'filename': filename,
+                'update_progress_func':
+                    SimulationRunner.
+                    _get_update_progress_func_from_proxybar_data(
+                        proxybar_data),
+                'current_rep': current_rep,
+                'results': current_sim_results,
+                # Number of repetitions either already merged or assigned
+                # to a chunk
+                'scheduled_reps': current_rep,
+                'next_chunk_index': 0,
+                'next_merge_index': 0,
+                # Chunks that finished before some previous chunk
+                'finished_chunks': {},
+                'num_pending': 0,
+                # Results merged since the last checkpoint
+                'delta_results': SimulationResults(),
+                'last_saved_rep': current_rep,
+                'last_save_time': time(),
+                'done': False
+            }
+            self._variations.append(variation)
+
+            if cached is not None:
+                # There is nothing left to simulate
+                variation['done'] = True
+                variation['update_progress_func'](runner.rep_max)
+                self._save_variation(variation)
+            elif current_sim_results is not None:
+                # The loaded partial results may already satisfy the stop
+                # criteria.
+                self._check_variation_done(variation)
+
+        self._submit_chunks()
+
+    def _check_variation_done(self, variation):
+        """
+        Check the stop criteria of a variation and finish it if it was
+        reached.
+
+        Parameters
+        ----------
+        variation : dict
+            The variation data.
+        """
+        runner = self._runner
+        # pylint: disable=W0212
+        if runner._continue_simulation(variation['params'],
+                                       variation['results'],
+                                       variation['current_rep']):
+            return
+
+        variation['done'] = True
+        variation['update_progress_func'](runner.rep_max)
+        runner._check_memory_budget(variation['params'],
+                                    variation['results'])
+        runner._on_simulate_current_params_finish(variation['params'],
+                                                  variation['results'])
+        self._save_variation(variation)
+        runner._cache_results(variation['params'], variation['current_rep'],
+                              variation['results'])
+
+    def _save_variation(self, variation):
+        """
+        Save the partial results of a variation, if the results filename
+        was set in the runner.
+
+        Parameters
+        ----------
+        variation : dict
+            The variation data.
+        """
+        if variation['filename'] is not None:
+            # pylint: disable=W0212
+            self._runner._save_partial_results(variation['current_rep'],
+                                               variation['params'],
+                                               variation['results'],
+                                               variation['filename'])
+            variation['last_saved_rep'] = variation['current_rep']
+            variation['last_save_time'] = time()
+
+    def _checkpoint_variation(self, variation):
+        """
+        Append the results merged since the last checkpoint of a variation
+        to its checkpoint log, if the results filename was set in the
+        runner.
+
+        Parameters
+        ----------
+        variation : dict
+            The variation data.
+        """
+        if variation['filename'] is not None:
+            # pylint: disable=W0212
+            self._runner._append_partial_results(variation['current_rep'],
+                                                 variation['params'],
+                                                 variation['delta_results'],
+                                                 variation['filename'])
+            variation['delta_results'] = SimulationResults()
+            variation['last_saved_rep'] = variation['current_rep']
+            variation['last_save_time'] = time()
+
+    def _submit_chunks(self):
+        """
+        Submit new chunks to the view while there are free workers and
+        repetitions left to simulate.
+        """
+        rep_max = self._runner.rep_max
+        reps_per_chunk = self._runner.reps_per_chunk
+        while len(self._pending) < self._max_pending:
+            candidates = [(v['num_pending'], index)
+                          for index, v in enumerate(self._variations)
+                          if not v['done'] and v['scheduled_reps'] < rep_max]
+            if not candidates:
+                break
+
+            # The variation with fewer running chunks gets the next one
+            index = min(candidates)[1]
+            variation = self._variations[index]
+            num_reps = min(reps_per_chunk,
+                           rep_max - variation['scheduled_reps'])
+            async_result = self._view.apply_async(
+                SimulationRunner._simulate_chunk_parallel,
+                self._runner, variation['params'], num_reps,
+                variation['scheduled_reps'])
+
+            self._pending.append(
+                (index, variation['next_chunk_index'], async_result))
+            variation['next_chunk_index'] += 1
+            variation['scheduled_reps'] += num_reps
+            variation['num_pending'] += 1
+
+    def _merge_chunk(self, variation, chunk_index, chunk_result):
+        """
+        Merge the results of all finished chunks of a variation that
+        follow the already merged ones.
+
+        Parameters
+        ----------
+        variation : dict
+            The variation data.
+        chunk_index : int
+            The index of the finished chunk.
+        chunk_result : (int, SimulationResults)
+            The value returned by the `_simulate_chunk_parallel` method.
+        """
+        variation['finished_chunks'][chunk_index] = chunk_result
+        while (not variation['done'] and
+               variation['next_merge_index'] in variation['finished_chunks']):
+            num_reps, chunk_sim_results = variation['finished_chunks'].pop(
+                variation['next_merge_index'])
+            variation['next_merge_index'] += 1
+
+            if variation['results'] is None:
+                # The results are updated in place when other chunks are
+                # merged and thus we store a copy as the delta
+                variation['results'] = chunk_sim_results
+                variation['delta_results'].merge_all_results(
+                    copy.deepcopy(chunk_sim_results))
+            else:
+                variation['results'].merge_all_results(chunk_sim_results)
+                variation['delta_results'].merge_all_results(
+                    chunk_sim_results)
+            variation['current_rep'] += num_reps
+            variation['update_progress_func'](variation['current_rep'])
+
+            self._check_variation_done(variation)
+
+            # Append the new results to the checkpoint log each
+            # partial_results_save_reps iterations as well as each
+            # partial_results_save_interval seconds
+            runner = self._runner
+            if (not variation['done'] and
+                    (variation['current_rep'] - variation['last_saved_rep']
+                     >= runner.partial_results_save_reps or
+                     time() - variation['last_save_time'] >
+                     runner.partial_results_save_interval)):
+                self._checkpoint_variation(variation)
+
+    def wait(self):
+        """
+        Wait until the simulation of all variations is finished.
+        """
+        while not all(v['done'] for v in self._variations):
+            self._poll()
+
+    def iter_finished(self):
+        """
+        Yield the results of each variation as soon as it is finished.
+
+        Yields
+        ------
+        (int, (int, SimulationResults, str))
+            The index of the variation and the number of repetitions, the
+            results and the name of the partial results file (or None) of
+            the variation.
+        """
+        yielded = set()
+        while True:
+            for index, variation in enumerate(self._variations):
+                if variation['done'] and index not in yielded:
+                    yielded.add(index)
+                    yield index, (variation['current_rep'],
+                                  variation['results'],
+                                  variation['filename'])
+            if len(yielded) == len(self._variations):
+                break
+            self._poll()
+
+    def _poll(self):
+        """
+        Wait (at most `_poll_interval` seconds) for some chunk to finish,
+        merge the results of the finished chunks and submit new ones.
+        """
+        # If a variation is not done there is at least one pending chunk
+        # for it
+        self._pending[0][2].wait(self._poll_interval)
+
+        still_pending = []
+        for index, chunk_index, async_result in self._pending:
+            if async_result.ready():
+                variation = self._variations[index]
+                variation['num_pending'] -= 1
+                # This will raise any exception raised in the worker
+                chunk_result = async_result.get()
+                if not variation['done']:
+                    self._merge_chunk(variation, chunk_index,
+                                      chunk_result)
+            else:
+                still_pending.append(
+                    (index, chunk_index, async_result))
+        self._pending = still_pending
+
+        self._submit_chunks()
+
+    def get(self):
+        """
+        Get the results of all variations.
+
+        Returns
+        -------
+        list[(int, SimulationResults, str)]
+            The number of repetitions, the results and the name of the
+            partial results file (or None) of each variation.
+        """
+        self.wait()
+        return [(v['current_rep'], v['results'], v['filename'])
+                for v in self._variations]
+# xxxxxxxxxx _ChunkedParallelSimulation - END xxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+
+
+# xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+# xxxxxxxxxxxxxxx _VariationsParallelSimulation - START xxxxxxxxxxxxxxxxxxx
+# xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+class _VariationsParallelSimulation(object):  # pragma: no cover
+    """
+    Simulate each parameters variation as a separated task in the workers
+    of a view.
+
+    This is used by the :meth:`SimulationRunner.iter_simulate` method when
+    the `reps_per_chunk` attribute of the runner is None. Contrary to the
+    object returned by the `map` method of a view, the results of each
+    variation can be obtained as soon as it is finished with the
+    `iter_finished` method.
+
+    Parameters
+    ----------
+    runner : SimulationRunner
+        The simulation runner.
+    view : LoadBalancedView | LocalProcessPoolView
+        The view used to run the variations. It must have the
+        `apply_async` method.
+    params_list : list[SimulationParameters]
+        The unpacked parameters of each variation.
+    proxybar_data_list : list
+        The proxy progressbar data of each variation (see
+        `SimulationRunner._get_parallel_update_progress_function`).
+    """
+    # Maximum time (in seconds) waiting for a single variation before
+    # checking the other ones.
+    _poll_interval = 0.05
+
+    def __init__(self, runner, view, params_list, proxybar_data_list):
+        self._async_results = [
+            view.apply_async(
+                SimulationRunner._simulate_for_current_params_parallel,
+                runner, current_params, proxybar_data)
+            for current_params, proxybar_data in zip(params_list,
+                                                     proxybar_data_list)]
+
+    def wait(self):
+        """
+        Wait until the simulation of all variations is finished.
+        """
+        for async_result in self._async_results:
+            async_result.wait()
+
+    def iter_finished(self):
+        """
+        Yield the results of each variation as soon as it is finished.
+
+        Yields
+        ------
+        (int, (int, SimulationResults, str))
+            The index of the variation and the number of repetitions, the
+            results and the name of the partial results file (or None) of
+            the variation.
+        """
+        pending = list(enumerate(self._async_results))
+        while pending:
+            pending[0][1].wait(self._poll_interval)
+            still_pending = []
+            for index, async_result in pending:
+                if async_result.ready():
+                    # This will raise any exception raised in the worker
+                    yield index, async_result.get()
+                else:
+                    still_pending.append((index, async_result))
+            pending = still_pending
+
+    def get(self):
+        """
+        Get the results of all variations.
+
+        Returns
+        -------
+        list[(int, SimulationResults, str)]
+            The number of repetitions, the results and the name of the
+            partial results file (or None) of each variation.
+        """
+        return [async_result.get() for async_result in self._async_results]
+# xxxxxxxxxx _VariationsParallelSimulation - END xxxxxxxxxxxxxxxxxxxxxxxxxx
@@ -0,0 +1,650 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module implementing a "view" of worker processes connected with ZMQ
+sockets, which can be used in place of an IPython view in the
+:meth:`.SimulationRunner.simulate_in_parallel` method.
+
+The :class:`ZMQBrokerView` object runs a small broker (in a background
+thread) that sends the tasks (pickled functions and their arguments, such
+as a :class:`.SimulationRunner` object and a :class:`.SimulationParameters`
+object) to the connected workers and receives their results. Workers are
+started with the :func:`run_zmq_worker` function, either by the view
+itself (local workers) or by running this module in any machine that can
+reach the broker::
+
+    python -m pyphysim.simulations.zmqview tcp://broker_host:5570
+
+Each worker asks for a new task when it is idle and sends heartbeats while
+it is running a task. The tasks of workers that stop sending heartbeats
+(because they died or their machine was disconnected) are sent again to
+other workers.
+
+Note that, as with IPython engines, the workers must be able to import the
+module where the subclass of :class:`.SimulationRunner` is implemented.
+"""
+
+import os
+import socket
+import threading
+import itertools
+import multiprocessing
+import uuid
+from collections import OrderedDict, deque
+from time import time
+
+try:
+    import cPickle as pickle
+except ImportError:  # pragma: no cover
+    import pickle
+
+try:
+    import queue
+except ImportError:  # pragma: no cover
+    import Queue as queue
+
+try:
+    # noinspection PyUnresolvedReferences
+    import zmq
+except ImportError:  # pragma: no cover
+    # We don't have a fallback for zmq, but only the ZMQBrokerView class
+    # and the run_zmq_worker function require it
+    pass
+
+__all__ = ["ZMQBrokerView", "run_zmq_worker"]
+
+
+# xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+# xxxxxxxxxxxxxxx Worker xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+# xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+def _send_heartbeats(context, address, worker_id, heartbeat_interval,
+                     stop_event):  # pragma: no cover
+    """
+    Send a heartbeat message to the broker each `heartbeat_interval`
+    seconds until `stop_event` is set.
+
+    This is run in a separated thread of the worker process, such that the
+    heartbeats are sent even while the worker is running a task.
+
+    Parameters
+    ----------
+    context : zmq.Context
+        The ZMQ context of the worker.
+    address : str
+        The address of the broker.
+    worker_id : str
+        The worker ID.
+    heartbeat_interval : float
+        The time (in seconds) between two heartbeats.
+    stop_event : threading.Event
+        Event set when the worker is finished.
+    """
+    heartbeat_socket = context.socket(zmq.DEALER)
+    heartbeat_socket.setsockopt(zmq.LINGER, 0)
+    heartbeat_socket.connect(address)
+    message = pickle.dumps(('heartbeat', worker_id), pickle.HIGHEST_PROTOCOL)
+    while not stop_event.is_set():
+        heartbeat_socket.send(message)
+        stop_event.wait(heartbeat_interval)
+    heartbeat_socket.close()
+
+
+def run_zmq_worker(address, heartbeat_interval=1.0,
+                   max_tasks=None):  # pragma: no cover
+    """
+    Run a worker that connects to the broker of a :class:`ZMQBrokerView`
+    and runs the tasks it receives.
+
+    The worker runs until it runs `max_tasks` tasks or it is killed. If
+    the broker is restarted (or another broker binds to the same address)
+    the worker reconnects to it.
+
+    Parameters
+    ----------
+    address : str
+        The address of the broker. Ex: 'tcp://192.168.0.117:5570'.
+    heartbeat_interval : float
+        The time (in seconds) between two heartbeats. It must be lower
+        than the `worker_timeout` of the broker.
+    max_tasks : int, optional
+        The maximum number of tasks. If it is None (default), the number
+        of tasks is not limited.
+    """
+    worker_id = '{0}-{1}-{2}'.format(socket.gethostname(), os.getpid(),
+                                     uuid.uuid4().hex[:8])
+    protocol = pickle.HIGHEST_PROTOCOL
+    context = zmq.Context()
+    task_socket = context.socket(zmq.DEALER)
+    task_socket.setsockopt(zmq.IDENTITY, worker_id.encode('utf-8'))
+    task_socket.setsockopt(zmq.LINGER, 1000)
+    task_socket.connect(address)
+
+    stop_event = threading.Event()
+    heartbeat_thread = threading.Thread(
+        target=_send_heartbeats,
+        args=(context, address, worker_id, heartbeat_interval, stop_event))
+    heartbeat_thread.daemon = True
+    heartbeat_thread.start()
+
+    ready_message = pickle.dumps(('ready', worker_id), protocol)
+    num_tasks = 0
+    try:
+        while max_tasks is None or num_tasks < max_tasks:
+            # The ready message is sent again if no task is received, since
+            # the broker may have been restarted.
+            task_socket.send(ready_message)
+            if not task_socket.poll(1000 * heartbeat_interval):
+                continue
+
+            _, task_id, payload = pickle.loads(task_socket.recv())
+            try:
+                f, args = pickle.loads(payload)
+                result = ('result', worker_id, task_id, True, f(*args))
+            except Exception as e:  # pylint: disable=W0703
+                result = ('result', worker_id, task_id, False, e)
+
+            try:
+                data = pickle.dumps(result, protocol)
+            except Exception as e:  # pylint: disable=W0703
+                data = pickle.dumps(
+                    ('result', worker_id, task_id, False,
+                     RuntimeError('Could not pickle the task result: '
+                                  '{0!r}'.format(e))),
+                    protocol)
+            task_socket.send(data)
+            num_tasks += 1
+    finally:
+        stop_event.set()
+        heartbeat_thread.join()
+        task_socket.close()
+        context.term()
+
+
+# xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+# xxxxxxxxxxxxxxx Async Results xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+# xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+class _ZMQAsyncResult(object):
+    """
+    The result of a task submitted to a :class:`ZMQBrokerView`.
+
+    It has the same interface of the `multiprocessing.pool.AsyncResult`
+    class.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._success = None
+        self._value = None
+
+    def _set(self, success, value):
+        """
+        Set the result of the task. Only the first result of a task (which
+        may run more than once) is kept.
+
+        Parameters
+        ----------
+        success : bool
+            True if the task finished without raising an exception.
+        value : any
+            The value returned by the task, or the exception it raised.
+        """
+        if not self._event.is_set():
+            self._success = success
+            self._value = value
+            self._event.set()
+
+    def ready(self):
+        """
+        Check if the task is finished.
+
+        Returns
+        -------
+        bool
+            True if the task is finished.
+        """
+        return self._event.is_set()
+
+    def successful(self):
+        """
+        Check if the task finished without raising an exception.
+
+        Returns
+        -------
+        bool
+            True if the task finished without raising an exception.
+        """
+        if not self.ready():
+            raise ValueError("The task is not finished")
+        return self._success
+
+    def wait(self, timeout=None):
+        """
+        Wait until the task is finished or until `timeout` seconds pass.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The maximum time (in seconds) to wait.
+        """
+        self._event.wait(timeout)
+
+    def get(self, timeout=None):
+        """
+        Get the result of the task, waiting for it if necessary.
+
+        If the task raised an exception, that exception is raised here.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The maximum time (in seconds) to wait.
+
+        Returns
+        -------
+        any
+            The value returned by the task.
+        """
+        self.wait(timeout)
+        if not self.ready():
+            raise multiprocessing.TimeoutError()
+        if not self._success:
+            raise self._value
+        return self._value
+
+
+class _ZMQMapResult(object):
+    """
+    The results of the tasks submitted by the `map` method of a
+    :class:`ZMQBrokerView`.
+
+    Parameters
+    ----------
+    async_results : list[_ZMQAsyncResult]
+        The result of each task.
+    """
+
+    def __init__(self, async_results):
+        self._async_results = async_results
+
+    def ready(self):
+        """
+        Check if all tasks are finished.
+
+        Returns
+        -------
+        bool
+            True if all tasks are finished.
+        """
+        return all(r.ready() for r in self._async_results)
+
+    def wait(self, timeout=None):
+        """
+        Wait until all tasks are finished or until `timeout` seconds pass.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The maximum time (in seconds) to wait.
+        """
+        if timeout is None:
+            for async_result in self._async_results:
+                async_result.wait()
+        else:
+            deadline = time() + timeout
+            for async_result in self._async_results:
+                async_result.wait(max(deadline - time(), 0))
+
+    def get(self, timeout=None):
+        """
+        Get the results of all tasks, waiting for them if necessary.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The maximum time (in seconds) to wait.
+
+        Returns
+        -------
+        list
+            The value returned by each task.
+        """
+        self.wait(timeout)
+        return [r.get(0) for r in self._async_results]
+
+
+# xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+# xxxxxxxxxxxxxxx ZMQBrokerView - START xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+# xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+class ZMQBrokerView(object):
+    """
+    A "view" of worker processes connected to a ZMQ broker that can be
+    used in place of an IPython view in the
+    :meth:`.SimulationRunner.simulate_in_parallel` method.
+
+    This class implements the same interface of the
+    :class:`.LocalProcessPoolView` class, but the tasks are run by workers
+    (see :func:`run_zmq_worker`) that connect to a broker bound to `port`.
+    The workers can be started in the local machine by the view itself
+    (see the `num_local_workers` argument) or in any other machine, and
+    they can connect (or die) at any time.
+
+    The broker sends each task to an idle worker. If a worker stops
+    sending heartbeats for `worker_timeout` seconds it is considered dead
+    and its task is sent to another worker. A task that killed
+    `max_retries` + 1 workers fails with a RuntimeError.
+
+    Parameters
+    ----------
+    num_local_workers : int
+        The number of workers started in the local machine. The default
+        value is 0 (only remote workers).
+    port : int, optional
+        The port to bind the broker socket. If not provided, a random free
+        port is used (see the `address` property).
+    ip : str
+        The address of the interface to bind the broker socket. The
+        default value of '*' binds to all interfaces.
+    heartbeat_interval : float
+        The time (in seconds) between two heartbeats of the local workers.
+    worker_timeout : float
+        The time (in seconds) without any message from a worker after
+        which it is considered dead.
+    max_retries : int
+        The number of times a task is sent again after the worker running
+        it died.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+       view = ZMQBrokerView(num_local_workers=2, port=5570)
+       # Other workers can be started in other machines with
+       #   python -m pyphysim.simulations.zmqview tcp://this_host:5570
+       runner.simulate_in_parallel(view)
+       view.close()
+    """
+    # Maximum time (in seconds) the broker waits for messages from the
+    # workers before checking for new tasks and dead workers.
+    _poll_interval = 0.05
+
+    def __init__(self, num_local_workers=0, port=None, ip='*',
+                 heartbeat_interval=1.0, worker_timeout=10.0,
+                 max_retries=3):
+        self.heartbeat_interval = heartbeat_interval
+        self.worker_timeout = worker_timeout
+        self.max_retries = max_retries
+        self._num_local_workers = num_local_workers
+
+        self._context = zmq.Context()
+        self._socket = self._context.socket(zmq.ROUTER)
+        self._socket.setsockopt(zmq.LINGER, 0)
+        if port is None:
+            port = self._socket.bind_to_random_port(u'tcp://{0}'.format(ip))
+        else:
+            self._socket.bind(u'tcp://{0}:{1}'.format(ip, port))
+        self._port = port
+
+        # Tasks submitted by the apply_async method that were not seen by
+        # the broker thread yet
+        self._new_tasks = queue.Queue()
+        self._task_counter = itertools.count()
+
+        # The following variables are only used by the broker thread.
+        # Tasks waiting for an idle worker: deque of task_id
+        self._waiting_tasks = deque()
+        # Map each task_id to [payload, async_result, num_retries]
+        self._tasks = {}
+        # Map the worker_id of the idle workers to their socket identity
+        self._idle_workers = OrderedDict()
+        # Map the worker_id of the busy workers to the task_id they are
+        # running
+        self._busy_workers = {}
+        # Time of the last message received from each worker
+        self._last_seen = {}
+
+        # The local workers are started before the broker thread
+        self._local_workers = []
+        for _ in range(num_local_workers):
+            process = multiprocessing.Process(
+                target=run_zmq_worker,
+                args=(self.address, heartbeat_interval))
+            process.daemon = True
+            process.start()
+            self._local_workers.append(process)
+
+        self._stop_event = threading.Event()
+        self._broker_thread = threading.Thread(target=self._run_broker)
+        self._broker_thread.daemon = True
+        self._broker_thread.start()
+
+    @property
+    def port(self):
+        """
+        Get the port of the broker socket.
+
+        Returns
+        -------
+        int
+            The port.
+        """
+        return self._port
+
+    @property
+    def address(self):
+        """
+        Get the address the local workers use to connect to the broker.
+
+        Returns
+        -------
+        str
+            The address.
+        """
+        return 'tcp://127.0.0.1:{0}'.format(self._port)
+
+    def __len__(self):
+        """
+        Get the number of workers.
+
+        Returns
+        -------
+        int
+            The number of workers connected to the broker (or the number
+            of local workers, if it is greater).
+        """
+        return max(len(self._last_seen), self._num_local_workers)
+
+    def map(self, f, *sequences, **kwargs):
+        """
+        Call `f` for each element of the provided sequences in the
+        workers.
+
+        Parameters
+        ----------
+        f : callable
+            The function to be called. It must be pickle-able.
+        *sequences : list
+            One sequence for each argument of `f`.
+        block : bool, optional
+            If True, wait for all tasks and return the list with the
+            results. If False (default) return an object with the `wait`
+            and `get` methods.
+
+        Returns
+        -------
+        _ZMQMapResult | list
+            The results (or an object to get the results if `block` is
+            False) in the same order of the elements in `sequences`.
+        """
+        block = kwargs.get('block', False)
+        async_results = _ZMQMapResult(
+            [self.apply_async(f, *args) for args in zip(*sequences)])
+        if block is True:
+            return async_results.get()
+        return async_results
+
+    def apply_async(self, f, *args):
+        """
+        Call `f` with the arguments `args` in one of the workers.
+
+        Parameters
+        ----------
+        f : callable
+            The function to be called. It must be pickle-able.
+        *args
+            The arguments passed to `f`.
+
+        Returns
+        -------
+        _ZMQAsyncResult
+            An object with the `ready`, `wait` and `get` methods to get
+            the result.
+        """
+        # The task is pickled here, such that any pickling error is raised
+        # in the caller.
+        payload = pickle.dumps((f, args), pickle.HIGHEST_PROTOCOL)
+        async_result = _ZMQAsyncResult()
+        self._new_tasks.put((next(self._task_counter), payload,
+                             async_result))
+        return async_result
+
+    def close(self):
+        """
+        Wait for any pending task, stop the broker and the local workers.
+
+        Remote workers are not stopped and they will connect to a new
+        broker bound to the same address.
+        """
+        if self._broker_thread is None:
+            return
+        self._stop_event.set()
+        self._broker_thread.join()
+        self._broker_thread = None
+
+        for process in self._local_workers:
+            process.terminate()
+            process.join()
+        self._local_workers = []
+
+        self._socket.close()
+        self._context.term()
+
+    def _run_broker(self):
+        """
+        Receive the messages from the workers and send them the tasks
+        until the view is closed and there is no pending task.
+
+        This is run in a separated thread.
+        """
+        while not (self._stop_event.is_set() and self._new_tasks.empty() and
+                   not self._tasks):
+            if self._socket.poll(1000 * self._poll_interval):
+                self._receive_messages()
+            self._get_new_tasks()
+            self._check_dead_workers()
+            self._send_tasks()
+
+    def _receive_messages(self):
+        """
+        Process all messages received from the workers.
+        """
+        while True:
+            try:
+                identity, data = self._socket.recv_multipart(zmq.NOBLOCK)
+            except zmq.ZMQError:
+                break
+            message = pickle.loads(data)
+            worker_id = message[1]
+            self._last_seen[worker_id] = time()
+
+            if message[0] == 'ready':
+                # A ready message sent before the worker received its
+                # current task is ignored
+                if worker_id not in self._busy_workers:
+                    self._idle_workers[worker_id] = identity
+            elif message[0] == 'result':
+                _, _, task_id, success, value = message
+                if self._busy_workers.get(worker_id) == task_id:
+                    del self._busy_workers[worker_id]
+                # The task may have been sent again to another worker if
+                # this one was considered dead. Only the first result is
+                # kept.
+                if task_id in self._tasks:
+                    self._tasks.pop(task_id)[1]._set(success, value)
+
+    def _get_new_tasks(self):
+        """
+        Move the tasks submitted by the apply_async method to the queue of
+        tasks waiting for an idle worker.
+        """
+        while True:
+            try:
+                task_id, payload, async_result = self._new_tasks.get_nowait()
+            except queue.Empty:
+                break
+            self._tasks[task_id] = [payload, async_result, 0]
+            self._waiting_tasks.append(task_id)
+
+    def _check_dead_workers(self):
+        """
+        Forget the workers that did not send any message in the last
+        `worker_timeout` seconds and send their tasks again.
+        """
+        now = time()
+        dead_workers = [worker_id
+                        for worker_id, last_seen in self._last_seen.items()
+                        if now - last_seen > self.worker_timeout]
+        for worker_id in dead_workers:
+            del self._last_seen[worker_id]
+            self._idle_workers.pop(worker_id, None)
+            task_id = self._busy_workers.pop(worker_id, None)
+            if task_id not in self._tasks:
+                continue
+
+            task = self._tasks[task_id]
+            if task[2] >= self.max_retries:
+                del self._tasks[task_id]
+                task[1]._set(
+                    False,
+                    RuntimeError("The task was tried {0} times and the worker "
+                                 "running it died each time".format(
+                                     task[2] + 1)))
+            else:
+                task[2] += 1
+                # Tasks that are sent again go to the front of the queue
+                self._waiting_tasks.appendleft(task_id)
+
+    def _send_tasks(self):
+        """
+        Send the waiting tasks to the idle workers.
+        """
+        while self._waiting_tasks and self._idle_workers:
+            task_id = self._waiting_tasks.popleft()
+            if task_id not in self._tasks:
+                # The task was sent again but a result was received from
+                # the worker that was considered dead
+                continue
+            worker_id, identity = self._idle_workers.popitem(last=False)
+            message = pickle.dumps(('task', task_id, self._tasks[task_id][0]),
+                                   pickle.HIGHEST_PROTOCOL)
+            self._socket.send_multipart([identity, message])
+            self._busy_workers[worker_id] = task_id
+# xxxxxxxxxx ZMQBrokerView - END xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Run a worker for a ZMQBrokerView.")
+    parser.add_argument('address',
+                        help="The address of the broker. "
+                             "Ex: tcp://192.168.0.117:5570")
+    parser.add_argument('--heartbeat-interval', type=float, default=1.0,
+                        help="Time (in seconds) between two heartbeats.")
+    parser.add_argument('--max-tasks', type=int, default=None,
+                        help="Stop the worker after this number of tasks.")
+    arguments = parser.parse_args()
+    run_zmq_worker(arguments.address, arguments.heartbeat_interval,
+                   arguments.max_tasks)
@@ -316,7 +316,7 @@ def xor(a, b):
     return a.__xor__(b)
 
 
-def randn_c(*args):
+def randn_c(*args, **kwargs):
     """
     Generates a random circularly complex gaussian matrix.
 
@@ -326,6 +326,9 @@ def randn_c(*args):
         Variable number of arguments (int values) specifying the
         dimensions of the returned array. This is directly passed to the
         numpy.random.randn function.
+    rng : np.random.Generator | np.random.RandomState, optional
+        The random number generator used to generate the random values. If
+        not provided, the global RandomState in numpy will be used.
 
     Returns
     -------
@@ -341,10 +344,28 @@ def randn_c(*args):
     >>> a.dtype
     dtype('complex128')
 
+    >>> rng = np.random.default_rng(42)
+    >>> b = randn_c(2, rng=rng)
+    >>> np.all(b == randn_c(2, rng=np.random.default_rng(42)))
+    True
+
     """
-    # noinspection PyArgumentList
+    rng = kwargs.pop('rng', None)
+    if kwargs:  # pragma: no cover
+        raise TypeError("randn_c got an unexpected keyword argument "
+                        "'{0}'".format(list(kwargs.keys())[0]))
+
+    if rng is None:
+        # noinspection PyArgumentList
+        return (1.0 / math.sqrt(2.0)) * (
+            np.random.randn(*args) + (1j * np.random.randn(*args)))
+
+    # Both np.random.Generator and np.random.RandomState objects have the
+    # standard_normal method. The size must be None (and not an empty
+    # tuple) in order to get a single number.
+    size = args if args else None
     return (1.0 / math.sqrt(2.0)) * (
-        np.random.randn(*args) + (1j * np.random.randn(*args)))
+        rng.standard_normal(size) + (1j * rng.standard_normal(size)))
 
 
 def randn_c_RS(RS, *args):  # pragma: no cover
@@ -353,8 +374,9 @@ def randn_c_RS(RS, *args):  # pragma: no cover
 
     This is essentially the same as the the randn_c function. The only
     difference is that the randn_c function uses the global RandomState
-    object in numpy, while randn_c_RS use the provided RandomState
-    object. This allow us greater control.
+    object in numpy (unless its `rng` argument is provided), while
+    randn_c_RS use the provided RandomState object. This allow us greater
+    control.
 
     Parameters
     ----------
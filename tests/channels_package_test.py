@@ -205,6 +205,25 @@ class RayleighSampleGeneratorTestCase(unittest.TestCase):
         self.assertEqual(obj2.shape, self.obj2.shape)
         self.assertEqual(obj3.shape, self.obj3.shape)
 
+    def test_rng(self):
+        obj1 = fading_generators.RayleighSampleGenerator(
+            shape=3, rng=np.random.default_rng(10))
+        obj2 = fading_generators.RayleighSampleGenerator(
+            shape=3, rng=np.random.default_rng(10))
+        np.testing.assert_array_equal(obj1.get_samples(),
+                                      obj2.get_samples())
+        obj1.generate_more_samples(4)
+        obj2.generate_more_samples(4)
+        np.testing.assert_array_equal(obj1.get_samples(),
+                                      obj2.get_samples())
+
+        # The similar generator uses the same rng, but it generates
+        # different samples
+        obj3 = obj1.get_similar_fading_generator()
+        self.assertIs(obj3._rng, obj1._rng)
+        self.assertFalse(np.allclose(obj3.get_samples(),
+                                     obj1.get_samples()[:, -1]))
+
 
 class JakesSampleGeneratorTestCase(unittest.TestCase):
     def setUp(self):
@@ -305,6 +324,29 @@ class JakesSampleGeneratorTestCase(unittest.TestCase):
         np.testing.assert_array_almost_equal(self.obj1.get_samples(),
                                              obj2.get_samples())
 
+    def test_rng(self):
+        obj1 = fading_generators.JakesSampleGenerator(
+            self.Fd, self.Ts, self.NRays, shape=(3, 2),
+            RS=np.random.default_rng(3))
+        obj2 = fading_generators.JakesSampleGenerator(
+            self.Fd, self.Ts, self.NRays, shape=(3, 2),
+            RS=np.random.default_rng(3))
+        obj1.generate_more_samples(10)
+        obj2.generate_more_samples(10)
+        np.testing.assert_array_equal(obj1.get_samples(),
+                                      obj2.get_samples())
+
+        obj3 = obj1.get_similar_fading_generator()
+        self.assertIs(obj3.RS, obj1.RS)
+
+        # The generate_jakes_samples function also accepts an rng
+        _, h1 = fading_generators.generate_jakes_samples(
+            self.Fd, shape=(2,), rng=np.random.default_rng(5))
+        _, h2 = fading_generators.generate_jakes_samples(
+            self.Fd, shape=(2,), rng=np.random.default_rng(5))
+        self.assertEqual(h1.shape, (2, 100))
+        np.testing.assert_array_equal(h1, h2)
+
     def test_get_similar_fading_generator(self):
         obj1 = self.obj1.get_similar_fading_generator()
         obj2 = self.obj2.get_similar_fading_generator()
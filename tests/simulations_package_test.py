@@ -26,6 +26,7 @@ import unittest
 import doctest
 import numpy as np
 import glob
+import shutil
 from time import sleep
 from io import StringIO
 from itertools import repeat
@@ -51,6 +52,8 @@ except ImportError:  # pragma: nocover
 from pyphysim.simulations import configobjvalidation, parameters, progressbar, \
     results, runner, simulationhelpers
 from pyphysim.simulations.results import combine_simulation_results
+from pyphysim.simulations.cache import SimulationResultsCache, \
+    get_variation_key
 # noinspection PyProtectedMember
 from pyphysim.simulations.configobjvalidation import _parse_float_range_expr, \
     real_scalar_or_real_numpy_array_check, \
@@ -59,7 +62,8 @@ from pyphysim.simulations.parameters import SimulationParameters, \
     combine_simulation_parameters
 from pyphysim.simulations.results import Result, SimulationResults
 from pyphysim.simulations.runner import SimulationRunner, SkipThisOne, \
-    get_common_parser
+    LocalProcessPoolView, get_common_parser, timed_stage
+from pyphysim.simulations.zmqview import ZMQBrokerView
 from pyphysim.util import misc
 
 
@@ -1926,6 +1930,42 @@ class SimulationResultsTestCase(unittest.TestCase):
         self.assertEqual(
             set(simresults3.get_result_names()),
             {'name1', 'num_skipped_reps'})
+
+        # The results with the time of each stage of the simulation may
+        # also be missing in any of the objects
+        simresults4 = SimulationResults()
+        simresults4.add_new_result('name1', Result.SUMTYPE, 1)
+        simresults4.add_new_result('stage_wall_time:a', Result.SUMTYPE, 0.5)
+        simresults5 = SimulationResults()
+        simresults5.add_new_result('name1', Result.SUMTYPE, 2)
+        simresults5.add_new_result('stage_wall_time:b', Result.SUMTYPE, 1.5)
+        simresults5.add_new_result('stage_cpu_time:b', Result.SUMTYPE, 1.0)
+        simresults4.merge_all_results(simresults5)
+        self.assertEqual(
+            set(simresults4.get_result_names()),
+            {'name1', 'stage_wall_time:a', 'stage_wall_time:b',
+             'stage_cpu_time:b'})
+        self.assertEqual(simresults4['name1'][-1].get_result(), 3)
+        self.assertEqual(simresults4['stage_wall_time:a'][-1].get_result(),
+                         0.5)
+        self.assertEqual(simresults4['stage_wall_time:b'][-1].get_result(),
+                         1.5)
+
+        # The largest value of the memory usage results is kept
+        simresults4.add_new_result('peak_memory', Result.MISCTYPE, 100)
+        simresults6 = SimulationResults()
+        simresults6.add_new_result('name1', Result.SUMTYPE, 2)
+        simresults6.add_new_result('peak_memory', Result.MISCTYPE, 300)
+        simresults6.add_new_result('memory_growth_per_rep', Result.MISCTYPE,
+                                   10)
+        simresults4.merge_all_results(simresults6)
+        self.assertEqual(simresults4['peak_memory'][-1].get_result(), 300)
+        self.assertEqual(
+            simresults4['memory_growth_per_rep'][-1].get_result(), 10)
+        simresults6['peak_memory'][-1].update(200)
+        simresults4.merge_all_results(simresults6)
+        self.assertEqual(simresults4['peak_memory'][-1].get_result(), 300)
+        self.assertEqual(len(simresults4['peak_memory']), 1)
         # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
 
     def test_equal_and_not_equal_operators(self):
@@ -2426,6 +2466,113 @@ class _DummyRunner(SimulationRunner):
         return sim_results
 
 
+# The time to simulate each repetition increases with the SNR
+class _DummyRunnerWithCost(_DummyRunner):
+    def _run_simulation(self, current_params):
+        sleep(0.002 * current_params['SNR'])
+        return _DummyRunner._run_simulation(self, current_params)
+
+
+# Implements _run_simulation_batch instead of _run_simulation
+class _DummyRunnerBatch(_DummyRunner):
+    def __init__(self):
+        _DummyRunner.__init__(self)
+        # Only used for testing purposes
+        self.batch_sizes = []
+
+    def _run_simulation(self, current_params):  # pragma: no cover
+        raise RuntimeError('_run_simulation_batch should be called instead')
+
+    def _run_simulation_batch(self, current_params, num_reps):
+        self.batch_sizes.append(num_reps)
+        value = self.calc_result(current_params['SNR'],
+                                 current_params['bias'],
+                                 current_params['extra'])
+        sim_results = SimulationResults()
+        sim_results.add_new_result('lala', Result.RATIOTYPE,
+                                   value * num_reps, num_reps)
+        return sim_results
+
+    def _keep_going(self, current_params, current_sim_results, current_rep):
+        return current_rep < self.stop_rep
+
+
+# Raises an exception in the repetition number interrupt_rep (if it is
+# not None), as if the simulation was interrupted
+class _DummyRunnerWithInterruption(_DummyRunner):
+    def __init__(self):
+        _DummyRunner.__init__(self)
+        self.interrupt_rep = None
+        # Only used for testing purposes
+        self.num_calls = 0
+
+    def _run_simulation(self, current_params):
+        self.num_calls += 1
+        if self.num_calls == self.interrupt_rep:
+            raise RuntimeError('Simulation interrupted')
+        return _DummyRunner._run_simulation(self, current_params)
+
+
+# Times some stages of the simulation
+class _DummyRunnerWithStages(_DummyRunner):
+    def __init__(self):
+        _DummyRunner.__init__(self)
+        self.num_calls = 0
+
+    @timed_stage('calc')
+    def _calc(self, current_params):
+        return _DummyRunner._run_simulation(self, current_params)
+
+    def _run_simulation(self, current_params):
+        self.num_calls += 1
+        with self.timed('sleep'):
+            sleep(0.001)
+        # This stage does not run in all repetitions
+        if self.num_calls % 2 == 0:
+            with self.timed('even'):
+                pass
+        return self._calc(current_params)
+
+
+# Allocates a temporary array and keeps a small one in each repetition
+class _DummyRunnerWithMemory(_DummyRunner):
+    def __init__(self):
+        _DummyRunner.__init__(self)
+        self.kept_arrays = []
+
+    def _run_simulation(self, current_params):
+        temporary_array = np.ones(100000)
+        self.kept_arrays.append(np.ones(1000))
+        sim_results = _DummyRunner._run_simulation(self, current_params)
+        del temporary_array
+        return sim_results
+
+
+# Uses the random number generator of the runner
+class _DummyRunnerWithRng(SimulationRunner):
+    def __init__(self):
+        SimulationRunner.__init__(self, read_command_line_args=False)
+        self.rep_max = 7
+        self.update_progress_function_style = None
+        self.params.add('P', np.array([1., 2., 3., 4.]))
+        self.params.set_unpack_parameter('P')
+
+    def _run_simulation(self, current_params):
+        P = current_params['P']
+        sim_results = SimulationResults()
+        value = P * self.rng.random()
+        sim_results.add_new_result('result1', Result.RATIOTYPE, value, 1)
+        value2 = np.abs(misc.randn_c(rng=self.rng)) ** 2
+        sim_results.add_new_result('result2', Result.RATIOTYPE, value2, 1)
+        return sim_results
+
+
+# Stops the simulation after (at least) 4 repetitions
+class _DummyRunnerWithStopCriteria(_DummyRunner):
+    def _keep_going(self, current_params, current_sim_results, current_rep):
+        return current_rep < 4
+
+
 class _DummyRunnerRandom(SimulationRunner):  # pragma: no cover
     def __init__(self):
         SimulationRunner.__init__(self, read_command_line_args=False)
@@ -2690,6 +2837,582 @@ class SimulationRunnerTestCase(unittest.TestCase):
 
         _delete_pickle_files()
 
+    def test_simulate_with_local_workers(self):
+        dummyrunner = _DummyRunner()
+        filename = 'dummyrunner_local_results_bias_{bias}'
+        dummyrunner.set_results_filename(filename)
+
+        # Simulate in 2 local worker processes
+        dummyrunner.simulate(workers=2)
+
+        results_extra_1 = dummyrunner.results.get_result_values_list(
+            'lala', {'extra': 2.2})
+        expected_results_extra_1 = [3.5, 9.5, 15.5, 21.5, 27.5]
+        np.testing.assert_array_almost_equal(
+            results_extra_1, expected_results_extra_1)
+
+        results_extra_2 = dummyrunner.results.get_result_values_list(
+            'lala', {'extra': 4.1})
+        expected_results_extra_2 = [5.4, 11.4, 17.4, 23.4, 29.4]
+        np.testing.assert_array_almost_equal(
+            results_extra_2, expected_results_extra_2)
+        self.assertEqual(dummyrunner.runned_reps, [2] * 10)
+
+        # Results must be the same as in the serial simulation
+        sim_results = SimulationResults.load_from_file(
+            dummyrunner.results_filename)
+        self.assertEqual(sim_results, dummyrunner.results)
+        dummyrunner2 = _DummyRunner()
+        dummyrunner2.simulate()
+        self.assertEqual(dummyrunner.results, dummyrunner2.results)
+        _delete_pickle_files()
+
+        # xxxxxxxxxx Now with a progressbar and an explicit view xxxxxxxxxx
+        dummyrunner3 = _DummyRunner()
+        dummyrunner3.update_progress_function_style = 'text2'
+        view = LocalProcessPoolView(2)
+        self.assertEqual(len(view), 2)
+        dummyrunner3.simulate_in_parallel(view, wait=False)
+        dummyrunner3.wait_parallel_simulation()
+        view.close()
+        self.assertTrue(isinstance(dummyrunner3._pbar,
+                                   progressbar.ProgressbarMultiProcessServer))
+        self.assertEqual(dummyrunner3._pbar.total_final_count, 20)
+        self.assertEqual(dummyrunner3.results, dummyrunner2.results)
+
+    def test_simulate_with_local_workers_and_chunks(self):
+        # Each variation will be split in chunks of 3, 3 and 1 repetitions
+        dummyrunner = _DummyRunner()
+        dummyrunner.rep_max = 7
+        dummyrunner.reps_per_chunk = 3
+        dummyrunner.delete_partial_results_bool = False
+        dummyrunner.set_results_filename('dummyrunner_chunks_results')
+        dummyrunner.simulate(workers=3)
+        self.assertEqual(dummyrunner.runned_reps, [7] * 10)
+
+        dummyrunner2 = _DummyRunner()
+        dummyrunner2.rep_max = 7
+        dummyrunner2.simulate()
+
+        for extra in [2.2, 4.1]:
+            np.testing.assert_array_almost_equal(
+                dummyrunner.results.get_result_values_list(
+                    'lala', {'extra': extra}),
+                dummyrunner2.results.get_result_values_list(
+                    'lala', {'extra': extra}))
+        # The results of all chunks were merged
+        self.assertEqual(
+            [r.num_updates for r in dummyrunner.results['lala']], [7] * 10)
+
+        # The merged partial results were saved by the main process
+        pr = SimulationResults.load_from_file(
+            'partial_results/dummyrunner_chunks_results_unpack_04.pickle')
+        self.assertEqual(pr.current_rep, 7)
+        self.assertEqual(pr['lala'][0].num_updates, 7)
+
+        # Loading the partial results there is nothing left to simulate
+        dummyrunner3 = _DummyRunner()
+        dummyrunner3.rep_max = 7
+        dummyrunner3.reps_per_chunk = 3
+        dummyrunner3.set_results_filename('dummyrunner_chunks_results')
+        dummyrunner3.simulate(workers=2)
+        self.assertEqual(dummyrunner3.runned_reps, [7] * 10)
+        self.assertEqual(dummyrunner3.results, dummyrunner.results)
+        _delete_pickle_files()
+
+        # xxxxxxxxxx Stop criteria checked between chunks xxxxxxxxxxxxxxxxx
+        # _keep_going is True while less than 4 repetitions were merged,
+        # thus two chunks are merged for each variation.
+        dummyrunner4 = _DummyRunnerWithStopCriteria()
+        dummyrunner4.rep_max = 20
+        dummyrunner4.reps_per_chunk = 3
+        dummyrunner4.simulate(workers=2)
+        self.assertEqual(dummyrunner4.runned_reps, [6] * 10)
+        self.assertEqual(
+            [r.num_updates for r in dummyrunner4.results['lala']], [6] * 10)
+
+    def test_simulate_with_batches(self):
+        runner = _DummyRunnerBatch()
+        runner.rep_max = 20
+        runner.max_reps_per_batch = 4
+        runner.stop_rep = 20
+        runner.params.add('SNR', np.array([5.]))
+        runner.params.add('extra', np.array([2.2]))
+        runner.simulate()
+        self.assertEqual(runner.runned_reps, [20])
+        self.assertEqual(runner.batch_sizes, [1, 2, 4, 4, 4, 4, 1])
+        self.assertAlmostEqual(runner.results['lala'][0].get_result(),
+                               _DummyRunner.calc_result(5., 1.3, 2.2))
+
+        # _keep_going is checked after each batch
+        runner2 = _DummyRunnerBatch()
+        runner2.rep_max = 20
+        runner2.max_reps_per_batch = 4
+        runner2.stop_rep = 5
+        runner2.simulate()
+        self.assertEqual(runner2.runned_reps, [7] * 10)
+        self.assertEqual(runner2.batch_sizes, [1, 2, 4] * 10)
+
+        # Batches do not cross the boundaries of the chunks of repetitions
+        runner3 = _DummyRunnerBatch()
+        runner3.rep_max = 10
+        runner3.reps_per_chunk = 5
+        runner3.stop_rep = 20
+        runner3.params.add('SNR', np.array([5.]))
+        runner3.params.add('extra', np.array([2.2]))
+        runner3.simulate()
+        self.assertEqual(runner3.batch_sizes, [1, 2, 2, 1, 2, 2])
+
+        runner4 = _DummyRunnerBatch()
+        runner4.rep_max = 10
+        runner4.reps_per_chunk = 5
+        runner4.stop_rep = 20
+        runner4.simulate(workers=2)
+        self.assertEqual(runner4.runned_reps, [10] * 10)
+        for extra in [2.2, 4.1]:
+            np.testing.assert_array_almost_equal(
+                runner4.results.get_result_values_list(
+                    'lala', {'extra': extra}),
+                [_DummyRunner.calc_result(snr, 1.3, extra)
+                 for snr in [0., 5., 10., 15., 20.]])
+
+    def test_simulate_with_results_cache(self):
+        folder = 'dummyrunner_results_cache'
+        runner = _DummyRunnerBatch()
+        runner.rep_max = 4
+        runner.stop_rep = 20
+        runner.results_cache = SimulationResultsCache(folder)
+        runner.simulate()
+        self.assertEqual(len(runner.results_cache), 10)
+        self.assertEqual(runner.batch_sizes, [1, 2, 1] * 10)
+
+        # All the variations are in the cache
+        runner2 = _DummyRunnerBatch()
+        runner2.rep_max = 4
+        runner2.stop_rep = 20
+        runner2.results_cache = SimulationResultsCache(folder)
+        runner2.simulate()
+        self.assertEqual(runner2.batch_sizes, [])
+        self.assertEqual(runner2.runned_reps, [4] * 10)
+        self.assertEqual(runner2.results, runner.results)
+
+        # Only the new variations are simulated when the sweep is extended
+        runner3 = _DummyRunnerBatch()
+        runner3.rep_max = 4
+        runner3.stop_rep = 20
+        runner3.results_cache = SimulationResultsCache(folder)
+        runner3.params.add('SNR', np.array([0., 5., 10., 15., 20., 25.]))
+        runner3.simulate()
+        self.assertEqual(runner3.batch_sizes, [1, 2, 1] * 2)
+        self.assertEqual(len(runner3.results_cache), 12)
+        np.testing.assert_array_almost_equal(
+            runner3.results.get_result_values_list('lala', {'extra': 2.2}),
+            [_DummyRunner.calc_result(snr, 1.3, 2.2)
+             for snr in [0., 5., 10., 15., 20., 25.]])
+
+        # Changing the code version invalidates the cached results
+        runner4 = _DummyRunnerBatch()
+        runner4.rep_max = 4
+        runner4.stop_rep = 20
+        runner4.results_cache = SimulationResultsCache(folder)
+        runner4.code_version = '2'
+        runner4.simulate()
+        self.assertEqual(runner4.batch_sizes, [1, 2, 1] * 10)
+        shutil.rmtree(folder)
+
+        # Results of parallel simulations (split in chunks) are also cached
+        runner5 = _DummyRunnerBatch()
+        runner5.rep_max = 4
+        runner5.reps_per_chunk = 2
+        runner5.stop_rep = 20
+        runner5.results_cache = SimulationResultsCache(folder)
+        runner5.simulate(workers=2)
+        self.assertEqual(len(runner5.results_cache), 10)
+
+        runner6 = _DummyRunnerBatch()
+        runner6.rep_max = 4
+        runner6.reps_per_chunk = 2
+        runner6.stop_rep = 20
+        runner6.results_cache = SimulationResultsCache(folder)
+        runner6.simulate()
+        self.assertEqual(runner6.batch_sizes, [])
+        self.assertEqual(runner6.results, runner5.results)
+        shutil.rmtree(folder)
+
+    def test_iter_simulate(self):
+        expected = [_DummyRunner.calc_result(snr, 1.3, extra)
+                    for snr in [0., 5., 10., 15., 20.]
+                    for extra in [2.2, 4.1]]
+
+        dummyrunner = _DummyRunner()
+        variations = []
+        for current_params, current_results in dummyrunner.iter_simulate():
+            variations.append(current_params.unpack_index)
+            self.assertAlmostEqual(
+                current_results['lala'][-1].get_result(),
+                _DummyRunner.calc_result(current_params['SNR'], 1.3,
+                                         current_params['extra']))
+            # The results attribute has the variations finished so far
+            self.assertEqual(len(dummyrunner.results['lala']),
+                             len(variations))
+        self.assertEqual(variations, list(range(10)))
+        self.assertEqual(dummyrunner.runned_reps, [2] * 10)
+        np.testing.assert_array_almost_equal(
+            dummyrunner.results.get_result_values_list('lala'), expected)
+
+        # A results filename is required to flush the results
+        with self.assertRaises(RuntimeError):
+            next(dummyrunner.iter_simulate(flush_results=True))
+
+        # The results of the finished variations are saved after each one
+        dummyrunner2 = _DummyRunner()
+        dummyrunner2.set_results_filename('dummyrunner_iter_results')
+        results_iter = dummyrunner2.iter_simulate(flush_results=True)
+        next(results_iter)
+        next(results_iter)
+        flushed_results = SimulationResults.load_from_file(
+            'dummyrunner_iter_results.pickle')
+        self.assertEqual(flushed_results.runned_reps, [2, 2] + [0] * 8)
+        self.assertEqual([r.num_updates for r in flushed_results['lala']],
+                         [2, 2] + [0] * 8)
+        self.assertEqual(flushed_results.params, dummyrunner2.params)
+        # The cost of the variations can be estimated from the flushed
+        # results (unfinished variations get the maximum cost)
+        costs = dummyrunner2._get_variations_cost_from_previous_results(
+            dummyrunner2.params.get_unpacked_params_list())
+        self.assertEqual(len(costs), 10)
+        for _ in results_iter:
+            pass
+        flushed_results = SimulationResults.load_from_file(
+            'dummyrunner_iter_results.pickle')
+        self.assertEqual(flushed_results.runned_reps, [2] * 10)
+        np.testing.assert_array_almost_equal(
+            flushed_results.get_result_values_list('lala'), expected)
+
+        # Parallel simulation (the variations are yielded as they finish)
+        for reps_per_chunk in [None, 1]:
+            dummyrunner3 = _DummyRunner()
+            dummyrunner3.reps_per_chunk = reps_per_chunk
+            dummyrunner3.set_results_filename('dummyrunner_iter_results')
+            variations = []
+            for current_params, current_results in \
+                    dummyrunner3.iter_simulate(workers=2,
+                                               flush_results=True):
+                variations.append(current_params.unpack_index)
+                self.assertAlmostEqual(
+                    current_results['lala'][-1].get_result(),
+                    _DummyRunner.calc_result(current_params['SNR'], 1.3,
+                                             current_params['extra']))
+            self.assertEqual(sorted(variations), list(range(10)))
+            self.assertEqual(dummyrunner3.runned_reps, [2] * 10)
+            np.testing.assert_array_almost_equal(
+                dummyrunner3.results.get_result_values_list('lala'),
+                expected)
+
+        _delete_pickle_files()
+
+    def test_stage_timing(self):
+        # The timing of the stages is disabled by default
+        dummyrunner = _DummyRunnerWithStages()
+        dummyrunner.rep_max = 3
+        dummyrunner.simulate()
+        self.assertEqual(set(dummyrunner.results.get_result_names()),
+                         {'lala', 'elapsed_time', 'num_skipped_reps'})
+        np.testing.assert_array_almost_equal(
+            dummyrunner.results.get_result_values_list('lala'),
+            [_DummyRunner.calc_result(snr, 1.3, extra)
+             for snr in [0., 5., 10., 15., 20.] for extra in [2.2, 4.1]])
+
+        dummyrunner2 = _DummyRunnerWithStages()
+        dummyrunner2.rep_max = 3
+        dummyrunner2.stage_timing_enabled = True
+        dummyrunner2.simulate()
+        self.assertEqual(
+            set(dummyrunner2.results.get_result_names()),
+            {'lala', 'elapsed_time', 'num_skipped_reps',
+             'stage_wall_time:sleep', 'stage_cpu_time:sleep',
+             'stage_wall_time:even', 'stage_cpu_time:even',
+             'stage_wall_time:calc', 'stage_cpu_time:calc'})
+        # Times are accumulated over the repetitions of each variation
+        self.assertEqual(len(dummyrunner2.results['stage_wall_time:sleep']),
+                         10)
+        for result in dummyrunner2.results['stage_wall_time:sleep']:
+            self.assertEqual(result.type_code, Result.SUMTYPE)
+            self.assertEqual(result.num_updates, 3)
+            self.assertGreaterEqual(result.get_result(), 0.003)
+        for wall_time, elapsed_time in zip(
+                dummyrunner2.results.get_result_values_list(
+                    'stage_wall_time:sleep'),
+                dummyrunner2.results.get_result_values_list(
+                    'elapsed_time')):
+            self.assertLessEqual(wall_time, elapsed_time)
+        for result in dummyrunner2.results['stage_cpu_time:sleep']:
+            self.assertGreaterEqual(result.get_result(), 0.0)
+        # The 'even' stage does not run in all repetitions
+        self.assertEqual(len(dummyrunner2.results['stage_wall_time:even']),
+                         10)
+
+        # The stages are also timed in the worker processes
+        dummyrunner3 = _DummyRunnerWithStages()
+        dummyrunner3.rep_max = 3
+        dummyrunner3.stage_timing_enabled = True
+        dummyrunner3.simulate(workers=2)
+        self.assertEqual(
+            len(dummyrunner3.results['stage_wall_time:calc']), 10)
+        for result in dummyrunner3.results['stage_wall_time:sleep']:
+            self.assertGreaterEqual(result.get_result(), 0.003)
+
+    def test_memory_tracking(self):
+        import tracemalloc
+
+        # Memory tracking is disabled by default
+        dummyrunner = _DummyRunnerWithMemory()
+        dummyrunner.rep_max = 3
+        dummyrunner.simulate()
+        self.assertEqual(set(dummyrunner.results.get_result_names()),
+                         {'lala', 'elapsed_time', 'num_skipped_reps'})
+
+        dummyrunner2 = _DummyRunnerWithMemory()
+        dummyrunner2.rep_max = 3
+        dummyrunner2.memory_tracking_enabled = True
+        dummyrunner2.memory_budget = 10 ** 9
+        dummyrunner2.simulate()
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertEqual(len(dummyrunner2.results['peak_memory']), 10)
+        for peak_memory, growth in zip(
+                dummyrunner2.results.get_result_values_list('peak_memory'),
+                dummyrunner2.results.get_result_values_list(
+                    'memory_growth_per_rep')):
+            # Each repetition allocates a temporary array with 800 kB and
+            # keeps an array with 8 kB
+            self.assertGreaterEqual(peak_memory, 800000)
+            self.assertGreaterEqual(growth, 8000)
+            self.assertLess(growth, 800000)
+        np.testing.assert_array_almost_equal(
+            dummyrunner2.results.get_result_values_list('lala'),
+            [_DummyRunner.calc_result(snr, 1.3, extra)
+             for snr in [0., 5., 10., 15., 20.] for extra in [2.2, 4.1]])
+
+        # A warning is issued for each variation exceeding the budget
+        dummyrunner3 = _DummyRunnerWithMemory()
+        dummyrunner3.rep_max = 3
+        dummyrunner3.memory_tracking_enabled = True
+        dummyrunner3.memory_budget = 100000
+        dummyrunner3.params.add('SNR', np.array([5.]))
+        with self.assertWarns(RuntimeWarning):
+            dummyrunner3.simulate()
+
+        # The largest memory usage of the chunks of each variation is kept
+        dummyrunner4 = _DummyRunnerWithMemory()
+        dummyrunner4.rep_max = 3
+        dummyrunner4.reps_per_chunk = 1
+        dummyrunner4.memory_tracking_enabled = True
+        dummyrunner4.memory_budget = 100000
+        dummyrunner4.params.add('SNR', np.array([5.]))
+        with self.assertWarns(RuntimeWarning):
+            dummyrunner4.simulate(workers=2)
+        self.assertEqual(len(dummyrunner4.results['peak_memory']), 2)
+        for peak_memory in dummyrunner4.results.get_result_values_list(
+                'peak_memory'):
+            self.assertGreaterEqual(peak_memory, 800000)
+
+    def test_partial_results_checkpoint_log(self):
+        dummyrunner = _DummyRunnerWithInterruption()
+        dummyrunner.rep_max = 10
+        dummyrunner.partial_results_save_reps = 3
+        dummyrunner.interrupt_rep = 8
+        dummyrunner.delete_partial_results_bool = False
+        dummyrunner.params.add('SNR', np.array([5.]))
+        dummyrunner.params.add('extra', np.array([2.2]))
+        dummyrunner.set_results_filename('dummyrunner_log_results')
+        with self.assertRaises(RuntimeError):
+            dummyrunner.simulate()
+
+        current_params = dummyrunner.params.get_unpacked_params_list()[0]
+        # The simulate method adds the 'rep_max' parameter
+        current_params.parameters['rep_max'] = dummyrunner.rep_max
+        filename = dummyrunner._get_partial_results_filename(current_params)
+        log_filename = dummyrunner._get_partial_results_log_filename(
+            filename)
+        # Only the new results are appended at each checkpoint
+        self.assertFalse(os.path.exists(filename))
+        records = runner._load_checkpoint_log(log_filename)
+        self.assertEqual([rep for rep, _ in records], [3, 6])
+        self.assertEqual(
+            [delta['lala'][-1].num_updates for _, delta in records], [3, 3])
+
+        # An incomplete record at the end of the log is ignored and removed
+        log_size = os.path.getsize(log_filename)
+        with open(log_filename, 'ab') as log_file:
+            log_file.write(b'\x00\x00\x00')
+        current_rep, sim_results = dummyrunner._load_partial_results(
+            current_params, filename)
+        self.assertEqual(current_rep, 6)
+        self.assertEqual(sim_results['lala'][-1].num_updates, 6)
+        self.assertEqual(os.path.getsize(log_filename), log_size)
+
+        # The simulation is resumed from the log, which is compacted at the
+        # end
+        dummyrunner2 = _DummyRunnerWithInterruption()
+        dummyrunner2.rep_max = 10
+        dummyrunner2.partial_results_save_reps = 3
+        dummyrunner2.delete_partial_results_bool = False
+        dummyrunner2.params.add('SNR', np.array([5.]))
+        dummyrunner2.params.add('extra', np.array([2.2]))
+        dummyrunner2.set_results_filename('dummyrunner_log_results')
+        dummyrunner2.simulate()
+        self.assertEqual(dummyrunner2.num_calls, 4)
+        self.assertEqual(dummyrunner2.runned_reps, [10])
+        self.assertEqual(dummyrunner2.results['lala'][0].num_updates, 10)
+        self.assertAlmostEqual(dummyrunner2.results['lala'][0].get_result(),
+                               _DummyRunner.calc_result(5., 1.3, 2.2))
+        self.assertTrue(os.path.exists(filename))
+        self.assertFalse(os.path.exists(log_filename))
+
+        # Records already in the partial results file (the compaction was
+        # interrupted before removing the log) are not replayed
+        for record in records:
+            runner._append_to_checkpoint_log(log_filename, record)
+        current_rep, sim_results = dummyrunner._load_partial_results(
+            current_params, filename)
+        self.assertEqual(current_rep, 10)
+        self.assertEqual(sim_results['lala'][-1].num_updates, 10)
+
+        os.remove(log_filename)
+        _delete_pickle_files()
+
+    def test_cost_aware_scheduling(self):
+        runner = _DummyRunnerWithCost()
+        runner.set_results_filename('dummyrunner_cost_results')
+        runner.simulate()
+
+        # The costs are estimated from the results of the previous
+        # simulation and the most expensive variations come first
+        runner2 = _DummyRunnerWithCost()
+        runner2.set_results_filename('dummyrunner_cost_results')
+        params_list = runner2.params.get_unpacked_params_list()
+        order = runner2._get_variations_order(None, params_list)
+        snrs = [params_list[i]['SNR'] for i in order]
+        self.assertEqual(snrs, sorted(snrs, reverse=True))
+        self.assertEqual(sorted(order), list(range(10)))
+
+        runner2.cost_aware_scheduling = False
+        self.assertIsNone(runner2._get_variations_order(None, params_list))
+
+        # New points in the sweep get the maximum cost
+        runner3 = _DummyRunnerWithCost()
+        runner3.set_results_filename('dummyrunner_cost_results')
+        runner3.params.add('SNR', np.array([0., 5., 10., 15., 20., 25.]))
+        runner3.results.set_parameters(runner3.params)
+        params_list3 = runner3.params.get_unpacked_params_list()
+        costs = runner3._get_variations_cost_from_previous_results(
+            params_list3)
+        for current_params, cost in zip(params_list3, costs):
+            if current_params['SNR'] == 25.:
+                self.assertEqual(cost, max(costs))
+
+        # The results are put back in the original order
+        runner2.cost_aware_scheduling = True
+        runner2.simulate(workers=2)
+        self.assertEqual(runner2.results, runner.results)
+        self.assertEqual(runner2.runned_reps, [2] * 10)
+        self.assertIsNone(runner2._variations_order)
+        _delete_pickle_files()
+
+        # Without previous results a calibration pass can be used
+        runner4 = _DummyRunnerWithCost()
+        self.assertIsNone(runner4._get_variations_order(None, params_list))
+        runner4.calibration_reps = 1
+        view = LocalProcessPoolView(2)
+        order = runner4._get_variations_order(view, params_list)
+        view.close()
+        snrs = [params_list[i]['SNR'] for i in order]
+        self.assertEqual(snrs, sorted(snrs, reverse=True))
+
+    def test_confidence_interval_stop_criterion(self):
+        # The result of _DummyRunner is constant and the confidence
+        # interval has zero width. Therefore, the simulation stops after
+        # the minimum number of updates.
+        runner = _DummyRunner()
+        runner.rep_max = 100
+        runner.add_confidence_interval_stop_criterion('lala', 0.05,
+                                                      min_updates=8)
+        runner.simulate()
+        self.assertEqual(runner.runned_reps, [8] * 10)
+
+        # The relative half width of the 95% confidence interval of
+        # result1 is approximately 1.96 * 0.577 / sqrt(n), which is smaller
+        # than 0.05 for n >= 512.
+        runner2 = _DummyRunnerWithRng()
+        runner2.rng_seed = 10
+        runner2.rep_max = 5000
+        runner2.add_confidence_interval_stop_criterion('result1', 0.05)
+        runner2.simulate()
+        for reps, result in zip(runner2.runned_reps,
+                                runner2.results['result1']):
+            self.assertTrue(300 < reps < 800)
+            lower, upper = result.get_confidence_interval(95)
+            self.assertLessEqual((upper - lower) / 2.0,
+                                 0.05 * result.get_result_mean())
+
+        # The criterion is also checked between chunks
+        runner3 = _DummyRunner()
+        runner3.rep_max = 100
+        runner3.reps_per_chunk = 5
+        runner3.add_confidence_interval_stop_criterion('lala', 0.05,
+                                                      min_updates=8)
+        runner3.simulate(workers=2)
+        self.assertEqual(runner3.runned_reps, [10] * 10)
+
+    def test_simulate_with_rng_seed(self):
+        def get_results(runner):
+            return [r.get_result() for r in runner.results['result1']] + \
+                [r.get_result() for r in runner.results['result2']]
+
+        runner1 = _DummyRunnerWithRng()
+        runner1.rng_seed = 42
+        runner1.simulate()
+        self.assertEqual(len(set(get_results(runner1))), 8)
+
+        # Same seed gives the same results
+        runner2 = _DummyRunnerWithRng()
+        runner2.rng_seed = 42
+        runner2.simulate()
+        self.assertEqual(get_results(runner1), get_results(runner2))
+
+        # A different seed gives different results
+        runner3 = _DummyRunnerWithRng()
+        runner3.rng_seed = 43
+        runner3.simulate()
+        self.assertNotEqual(get_results(runner1), get_results(runner3))
+
+        # Parallel simulation gives the same results of the serial one
+        runner4 = _DummyRunnerWithRng()
+        runner4.rng_seed = 42
+        runner4.simulate(workers=2)
+        self.assertEqual(get_results(runner1), get_results(runner4))
+
+        # Each chunk of repetitions uses its own generator and the results
+        # do not depend on the number of workers
+        runner5 = _DummyRunnerWithRng()
+        runner5.rng_seed = 42
+        runner5.reps_per_chunk = 3
+        runner5.simulate()
+        self.assertNotEqual(get_results(runner1), get_results(runner5))
+        runner6 = _DummyRunnerWithRng()
+        runner6.rng_seed = 42
+        runner6.reps_per_chunk = 3
+        runner6.simulate(workers=2)
+        runner7 = _DummyRunnerWithRng()
+        runner7.rng_seed = 42
+        runner7.reps_per_chunk = 3
+        runner7.simulate(workers=3)
+        self.assertEqual(get_results(runner6), get_results(runner7))
+        # The only difference to the serial simulation is the order the
+        # results are summed
+        np.testing.assert_array_almost_equal(get_results(runner5),
+                                             get_results(runner6))
+
     # This test method is normally skipped, unless you have started an
     # IPython cluster with a "tests" profile so that you have at least one
     # engine running.
@@ -2957,6 +3680,184 @@ class SimulationRunnerTestCase(unittest.TestCase):
         _delete_pickle_files()
 
 
+# xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+# xxxxxxxxxxxxxxx Cache Module xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+# xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+class SimulationResultsCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.folder = 'results_cache_test'
+        self.cache = SimulationResultsCache(self.folder)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def test_get_variation_key(self):
+        runner = _DummyRunner()
+        params_list = runner.params.get_unpacked_params_list()
+        keys = [get_variation_key(runner, p) for p in params_list]
+        # Each variation has a different key
+        self.assertEqual(len(set(keys)), len(keys))
+        # The key is stable
+        runner2 = _DummyRunner()
+        params_list2 = runner2.params.get_unpacked_params_list()
+        self.assertEqual(keys[0], get_variation_key(runner2, params_list2[0]))
+
+        # The key depends on the code_version, rep_max and rng_seed
+        # attributes of the runner
+        runner2.code_version = '2'
+        key2 = get_variation_key(runner2, params_list2[0])
+        self.assertNotEqual(keys[0], key2)
+        runner2.rep_max = 3
+        self.assertNotEqual(key2, get_variation_key(runner2, params_list2[0]))
+        runner3 = _DummyRunner()
+        runner3.rng_seed = 42
+        self.assertNotEqual(keys[0],
+                            get_variation_key(runner3, params_list[0]))
+
+        # The key depends on the class of the runner
+        runner4 = _DummyRunnerBatch()
+        self.assertNotEqual(keys[0],
+                            get_variation_key(runner4, params_list[0]))
+
+    def test_put_and_get(self):
+        self.assertEqual(len(self.cache), 0)
+        self.assertIsNone(self.cache.get('key1'))
+        self.assertFalse('key1' in self.cache)
+
+        sim_results = SimulationResults()
+        sim_results.add_new_result('lala', Result.SUMTYPE, 13)
+        self.cache.put('key1', 10, sim_results)
+        self.assertTrue('key1' in self.cache)
+        self.assertEqual(len(self.cache), 1)
+        current_rep, cached_results = self.cache.get('key1')
+        self.assertEqual(current_rep, 10)
+        self.assertEqual(cached_results, sim_results)
+
+        self.cache.put('key2', 20, sim_results)
+        self.assertEqual(len(self.cache), 2)
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+        self.assertIsNone(self.cache.get('key1'))
+
+    def test_evict(self):
+        sim_results = SimulationResults()
+        sim_results.add_new_result('lala', Result.SUMTYPE, 13)
+        self.cache.put('key1', 10, sim_results)
+        entry_size = os.path.getsize(self.cache._get_filename('key1'))
+        self.cache.put('key2', 10, sim_results)
+        self.cache.put('key3', 10, sim_results)
+        self.assertEqual(len(self.cache), 3)
+
+        # Make 'key2' the least recently used entry
+        for i, key in enumerate(['key2', 'key1', 'key3']):
+            os.utime(self.cache._get_filename(key), (1000 + i, 1000 + i))
+
+        self.cache.max_size = 2 * entry_size
+        self.cache._evict()
+        self.assertEqual(len(self.cache), 2)
+        self.assertFalse('key2' in self.cache)
+
+        # Getting an entry makes it the most recently used one
+        self.cache.get('key1')
+        self.cache.max_size = entry_size
+        self.cache._evict()
+        self.assertEqual(len(self.cache), 1)
+        self.assertTrue('key1' in self.cache)
+
+        # Without a maximum size nothing is evicted
+        self.cache.max_size = None
+        self.cache.put('key2', 10, sim_results)
+        self.cache.put('key3', 10, sim_results)
+        self.assertEqual(len(self.cache), 3)
+
+
+# xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+# xxxxxxxxxxxxxxx ZMQ View Module xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+# xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+def _zmq_task_add(a, b):
+    return a + b
+
+
+def _zmq_task_raise(message):
+    raise ValueError(message)
+
+
+def _zmq_task_exit_once(marker_filename, value):  # pragma: no cover
+    # Kill the worker running the task the first time it is run
+    if not os.path.exists(marker_filename):
+        open(marker_filename, 'w').close()
+        os._exit(1)
+    return value
+
+
+def _zmq_task_exit():  # pragma: no cover
+    os._exit(1)
+
+
+class ZMQBrokerViewTestCase(unittest.TestCase):
+    def setUp(self):
+        self.view = ZMQBrokerView(num_local_workers=2,
+                                  heartbeat_interval=0.1,
+                                  worker_timeout=1.0,
+                                  max_retries=1)
+        self.marker_filename = 'zmq_view_test_marker'
+
+    def tearDown(self):
+        self.view.close()
+        delete_file_if_possible(self.marker_filename)
+
+    def test_apply_async_and_map(self):
+        self.assertEqual(len(self.view), 2)
+        self.assertEqual(self.view.address,
+                         'tcp://127.0.0.1:{0}'.format(self.view.port))
+
+        async_result = self.view.apply_async(_zmq_task_add, 1, 2)
+        self.assertEqual(async_result.get(30), 3)
+        self.assertTrue(async_result.ready())
+        self.assertTrue(async_result.successful())
+
+        map_result = self.view.map(_zmq_task_add, [1, 2, 3], [10, 20, 30])
+        self.assertEqual(map_result.get(30), [11, 22, 33])
+        self.assertEqual(
+            self.view.map(_zmq_task_add, [4, 5], [1, 1], block=True), [5, 6])
+
+        # Exceptions raised in the workers are raised by the get method
+        async_result = self.view.apply_async(_zmq_task_raise, 'some error')
+        with self.assertRaises(ValueError):
+            async_result.get(30)
+        self.assertFalse(async_result.successful())
+
+    def test_task_of_dead_worker_is_sent_again(self):
+        async_result = self.view.apply_async(
+            _zmq_task_exit_once, self.marker_filename, 42)
+        self.assertEqual(async_result.get(30), 42)
+        self.assertTrue(os.path.exists(self.marker_filename))
+
+        # A task that kills every worker running it fails after max_retries
+        async_result = self.view.apply_async(_zmq_task_exit)
+        with self.assertRaises(RuntimeError):
+            async_result.get(30)
+
+    def test_simulate_in_parallel(self):
+        dummyrunner = _DummyRunner()
+        dummyrunner.simulate_in_parallel(self.view)
+        self.assertEqual(dummyrunner.runned_reps, [2] * 10)
+
+        dummyrunner2 = _DummyRunner()
+        dummyrunner2.simulate()
+        self.assertEqual(dummyrunner.results, dummyrunner2.results)
+
+        # The repetitions of each variation can also be split in chunks
+        dummyrunner3 = _DummyRunner()
+        dummyrunner3.rep_max = 7
+        dummyrunner3.reps_per_chunk = 3
+        dummyrunner3.simulate_in_parallel(self.view)
+        self.assertEqual(dummyrunner3.runned_reps, [7] * 10)
+        np.testing.assert_array_almost_equal(
+            dummyrunner3.results.get_result_values_list('lala'),
+            dummyrunner.results.get_result_values_list('lala'))
+
+
 # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
 # xxxxxxxxxxxxxxx Progressbar Module xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
 # xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
@@ -726,6 +726,25 @@ class MiscFunctionsTestCase(unittest.TestCase):
 
         self.assertEqual(misc.pretty_time(6137), '1h:42m:17s')
 
+    def test_randn_c(self):
+        A = misc.randn_c(3, 2)
+        self.assertEqual(A.shape, (3, 2))
+        self.assertEqual(A.dtype, complex)
+        self.assertTrue(isinstance(misc.randn_c(), complex))
+
+        # The same generator state gives the same values
+        B = misc.randn_c(3, 2, rng=np.random.default_rng(1234))
+        C = misc.randn_c(3, 2, rng=np.random.default_rng(1234))
+        np.testing.assert_array_equal(B, C)
+        self.assertEqual(B.shape, (3, 2))
+        self.assertTrue(
+            isinstance(misc.randn_c(rng=np.random.default_rng()), complex))
+
+        # A RandomState object can also be used
+        D = misc.randn_c(4, rng=np.random.RandomState(10))
+        E = misc.randn_c(4, rng=np.random.RandomState(10))
+        np.testing.assert_array_equal(D, E)
+
     def test_calc_decorrelation_matrix(self):
         A = misc.randn_c(3, 3)
 